@@ -5,6 +5,9 @@ SFTP Admin Backend Application Entry Point
 This is the main entry point for the SFTP Admin Backend application.
 It uses the application factory pattern from the app module for clean
 separation of concerns and modular architecture.
+
+This runs the Werkzeug development server and is intended for local
+development only. Production deployments use gunicorn (see gunicorn.conf.py).
 """
 
 import os
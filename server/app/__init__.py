@@ -2,22 +2,22 @@
 Application factory and initialization
 """
 import logging
-from flask import Flask
+import os
+import re
+import click
+import orjson
+from flask import Flask, request
+from flask.cli import with_appcontext
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
+from sqlalchemy import text
+from werkzeug.http import generate_etag
 
 from app.config.settings import get_config
 from app.models.database import db
-from app.services.auth_service import AuthService
-from app.services.user_service import UserService  
-from app.services.s3_service import S3Service
-from app.controllers.auth_controller import create_auth_blueprint
-from app.controllers.user_controller import create_user_blueprint
-from app.controllers.s3_controller import create_s3_blueprint
-from app.controllers.dashboard_controller import create_dashboard_blueprint
 from app.middleware.error_handler import register_error_handlers
 from app.utils.logger import setup_logging
+from app.utils.serialization import OrjsonProvider, json_response
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +34,7 @@ def create_app(config_name: str = None) -> Flask:
     
     # Create Flask app
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Load configuration
     config = get_config()
@@ -56,7 +57,7 @@ def create_app(config_name: str = None) -> Flask:
     
     # Setup logging
     setup_logging(config, 'logs/app.log')
-    logger.info(f"Starting {config.APP_NAME} v{config.APP_VERSION}")
+    logger.info("Starting %s v%s", config.APP_NAME, config.APP_VERSION)
     
     # Initialize extensions
     initialize_extensions(app, config)
@@ -73,26 +74,37 @@ def create_app(config_name: str = None) -> Flask:
     # Register error handlers
     register_error_handlers(app)
     
+    # Health and info payloads never change for the life of the process, so
+    # encode them once; probes that send If-None-Match get a 304
+    health_body = orjson.dumps({
+        "status": "healthy",
+        "app": config.APP_NAME,
+        "version": config.APP_VERSION,
+        "environment": app.config.get('ENV', 'development')
+    })
+    info_body = orjson.dumps({
+        "app": config.APP_NAME,
+        "version": config.APP_VERSION,
+        "description": "SFTP Admin Backend API",
+        "documentation": "/docs",
+        "health": "/health"
+    })
+    health_etag = generate_etag(health_body)
+    info_etag = generate_etag(info_body)
+    
     # Add health check endpoint
     @app.route('/health')
     def health_check():
-        return {
-            "status": "healthy",
-            "app": config.APP_NAME,
-            "version": config.APP_VERSION,
-            "environment": app.config.get('ENV', 'development')
-        }, 200
+        response = json_response(health_body)
+        response.set_etag(health_etag)
+        return response.make_conditional(request)
     
     # Add app info endpoint
     @app.route('/info')
     def app_info():
-        return {
-            "app": config.APP_NAME,
-            "version": config.APP_VERSION,
-            "description": "SFTP Admin Backend API",
-            "documentation": "/docs",
-            "health": "/health"
-        }, 200
+        response = json_response(info_body)
+        response.set_etag(info_etag)
+        return response.make_conditional(request)
     
     logger.info("Application initialization completed successfully")
     return app
@@ -100,9 +112,17 @@ def create_app(config_name: str = None) -> Flask:
 def initialize_extensions(app: Flask, config) -> None:
     """Initialize Flask extensions"""
     
-    # CORS
+    # CORS: match all configured origins with one pre-compiled regex instead of
+    # a per-request scan over the list
+    if "*" in config.CORS_ORIGINS:
+        cors_origins = "*"
+    else:
+        cors_origins = re.compile(
+            "^(?:" + "|".join(map(re.escape, sorted(config.CORS_ORIGINS))) + ")$",
+            re.IGNORECASE
+        )
     CORS(app, 
-         origins=config.CORS_ORIGINS,
+         origins=cors_origins,
          supports_credentials=True,
          allow_headers=["Content-Type", "Authorization"],
          methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"])
@@ -118,41 +138,58 @@ def initialize_database(app: Flask) -> None:
     # Initialize SQLAlchemy
     db.init_app(app)
     
-    # Initialize Flask-Migrate
-    migrate = Migrate(app, db)
+    # Flask-Migrate (and Alembic behind it) is only needed for `flask db ...` commands
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        from flask_migrate import Migrate
+        Migrate(app, db)
     
-    # Create tables if they don't exist (for development)
-    with app.app_context():
-        try:
-            db.create_all()
-            logger.info("Database tables created successfully")
-            
-            # Ensure admin user exists
-            from app.models.database import User
-            admin_user = User.query.filter_by(username='admin').first()
-            if not admin_user:
-                admin_user = User(
-                    username='admin',
-                    email='admin@atari.com',
-                    first_name='System',
-                    last_name='Administrator',
-                    role='admin',
-                    status='active',
-                    is_active=True
-                )
-                admin_user.set_password('admin')  # Default password
-                db.session.add(admin_user)
-                db.session.commit()
-                logger.info("Created default admin user")
-        except Exception as e:
-            logger.error(f"Database initialization failed: {str(e)}")
-            raise
+    # Schema creation and seeding run once via `flask init-db`, not on every worker start
+    app.cli.add_command(init_db_command)
     
     logger.info("Database initialized successfully")
 
+@click.command('init-db')
+@with_appcontext
+def init_db_command() -> None:
+    """Create database tables and the default admin user"""
+    try:
+        db.create_all()
+        logger.info("Database tables created successfully")
+        
+        # Ensure admin user exists
+        admin_exists = db.session.execute(
+            text("SELECT 1 FROM users WHERE username = :username LIMIT 1"),
+            {"username": "admin"}
+        ).first()
+        if not admin_exists:
+            from app.models.database import User
+            admin_user = User(
+                username='admin',
+                email='admin@atari.com',
+                first_name='System',
+                last_name='Administrator',
+                role='admin',
+                status='active',
+                is_active=True
+            )
+            admin_user.set_password('admin', get_config().BCRYPT_ROUNDS)  # Default password
+            db.session.add(admin_user)
+            db.session.commit()
+            logger.info("Created default admin user")
+    except Exception as e:
+        logger.error("Database initialization failed: %s", e)
+        raise
+    
+    click.echo("Database initialized")
+
 def initialize_services(config) -> dict:
     """Initialize application services"""
     
+    # Imported here so the SDKs behind each service load only when the app is built
+    from app.services.auth_service import AuthService
+    from app.services.user_service import UserService
+    from app.services.s3_service import S3Service
+    
     try:
         # Initialize services
         auth_service = AuthService(config)
@@ -169,12 +206,17 @@ def initialize_services(config) -> dict:
         return services
         
     except Exception as e:
-        logger.error(f"Service initialization failed: {str(e)}")
+        logger.error("Service initialization failed: %s", e)
         raise
 
 def register_blueprints(app: Flask, services: dict) -> None:
     """Register application blueprints"""
     
+    from app.controllers.auth_controller import create_auth_blueprint
+    from app.controllers.user_controller import create_user_blueprint
+    from app.controllers.s3_controller import create_s3_blueprint
+    from app.controllers.dashboard_controller import create_dashboard_blueprint
+    
     try:
         # Create blueprints with dependency injection
         auth_bp = create_auth_blueprint(services['auth_service'])
@@ -191,5 +233,5 @@ def register_blueprints(app: Flask, services: dict) -> None:
         logger.info("Blueprints registered successfully")
         
     except Exception as e:
-        logger.error(f"Blueprint registration failed: {str(e)}")
+        logger.error("Blueprint registration failed: %s", e)
         raise
\ No newline at end of file
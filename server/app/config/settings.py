@@ -2,83 +2,90 @@
 Application Configuration Management
 """
 import os
-from pathlib import Path
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import ClassVar
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Base configuration class"""
+    """Base configuration, parsed from the environment once by _load()"""
     
     # Application Settings
-    APP_NAME = "SFTP Admin Backend"
-    APP_VERSION = "1.0.0"
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    APP_NAME: ClassVar[str] = "SFTP Admin Backend"
+    APP_VERSION: ClassVar[str] = "1.0.0"
+    DEBUG: bool
     
     # Server Settings
-    HOST = os.getenv("HOST", "0.0.0.0")
-    PORT = int(os.getenv("PORT", 5050))
+    HOST: str
+    PORT: int
     
     # Security Settings
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "simple-secret-for-dev")
-    JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES", 3600))  # 1 hour
-    JWT_REFRESH_TOKEN_EXPIRES = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES", 86400))  # 24 hours
+    JWT_SECRET_KEY: str
+    JWT_ACCESS_TOKEN_EXPIRES: int
+    JWT_REFRESH_TOKEN_EXPIRES: int
+    BCRYPT_ROUNDS: int
     
     # AWS Settings
-    AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
-    AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-    AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+    AWS_REGION: str
+    AWS_ACCESS_KEY_ID: str | None
+    AWS_SECRET_ACCESS_KEY: str | None
     
     # AWS Transfer Family Settings
-    TRANSFER_SERVER_ID = os.getenv("TRANSFER_SERVER_ID")
-    IAM_ROLE_ARN = os.getenv("IAM_ROLE_ARN")
+    TRANSFER_SERVER_ID: str | None
+    IAM_ROLE_ARN: str | None
     
     # S3 Settings
-    S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "atari-files-transfer")
-    S3_UPLOAD_MAX_SIZE = int(os.getenv("S3_UPLOAD_MAX_SIZE", 100 * 1024 * 1024))  # 100MB
+    S3_BUCKET_NAME: str
+    S3_UPLOAD_MAX_SIZE: int
     
     # CORS Settings
-    CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    CORS_ORIGINS: frozenset[str]
     
     # Logging Settings
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_LEVEL: str
+    LOG_FORMAT: ClassVar[str] = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     # Rate Limiting
-    RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", 60))
+    RATE_LIMIT_PER_MINUTE: int
     
     # Database Settings
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_PORT = int(os.getenv("DB_PORT", 5432))
-    DB_NAME = os.getenv("DB_NAME", "atari_files_transfer")
-    DB_USER = os.getenv("DB_USER", "postgres")
-    DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-    DATABASE_URL = os.getenv("DATABASE_URL", f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+    DB_HOST: str
+    DB_PORT: int
+    DB_NAME: str
+    DB_USER: str
+    DB_PASSWORD: str
+    DATABASE_URL: str
     
     # SQLAlchemy Settings
-    SQLALCHEMY_DATABASE_URI = DATABASE_URL
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-        'echo': DEBUG  # SQL logging in debug mode
-    }
-    
-    @classmethod
-    def validate(cls) -> list[str]:
+    SQLALCHEMY_DATABASE_URI: str
+    SQLALCHEMY_ENGINE_OPTIONS: dict
+    SQLALCHEMY_TRACK_MODIFICATIONS: ClassVar[bool] = False
+    
+    TESTING: bool = False
+    
+    # Validation result, computed once per instance in __post_init__
+    _errors: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "_errors", tuple(self._check_required()))
+    
+    def validate(self) -> list[str]:
         """Validate required configuration values"""
+        return list(self._errors)
+    
+    def _check_required(self) -> list[str]:
+        """Collect errors for missing required configuration values"""
         errors = []
         
         required_vars = [
-            ("AWS_ACCESS_KEY_ID", cls.AWS_ACCESS_KEY_ID),
-            ("AWS_SECRET_ACCESS_KEY", cls.AWS_SECRET_ACCESS_KEY),
-            ("TRANSFER_SERVER_ID", cls.TRANSFER_SERVER_ID),
-            ("IAM_ROLE_ARN", cls.IAM_ROLE_ARN),
-            ("DB_HOST", cls.DB_HOST),
-            ("DB_USER", cls.DB_USER),
-            ("DB_PASSWORD", cls.DB_PASSWORD),
+            ("AWS_ACCESS_KEY_ID", self.AWS_ACCESS_KEY_ID),
+            ("AWS_SECRET_ACCESS_KEY", self.AWS_SECRET_ACCESS_KEY),
+            ("TRANSFER_SERVER_ID", self.TRANSFER_SERVER_ID),
+            ("IAM_ROLE_ARN", self.IAM_ROLE_ARN),
+            ("DB_HOST", self.DB_HOST),
+            ("DB_USER", self.DB_USER),
+            ("DB_PASSWORD", self.DB_PASSWORD),
         ]
         
         for var_name, var_value in required_vars:
@@ -87,44 +94,99 @@ class Config:
         
         return errors
     
-    @classmethod
-    def get_aws_config(cls) -> dict:
+    def get_aws_config(self) -> dict:
         """Get AWS configuration dictionary"""
         return {
-            "region_name": cls.AWS_REGION,
-            "aws_access_key_id": cls.AWS_ACCESS_KEY_ID,
-            "aws_secret_access_key": cls.AWS_SECRET_ACCESS_KEY,
+            "region_name": self.AWS_REGION,
+            "aws_access_key_id": self.AWS_ACCESS_KEY_ID,
+            "aws_secret_access_key": self.AWS_SECRET_ACCESS_KEY,
         }
 
-class DevelopmentConfig(Config):
+@lru_cache(maxsize=1)
+def _load() -> Config:
+    """Load .env and parse every environment variable exactly once"""
+    load_dotenv()
+    env = os.environ
+    
+    debug = env.get("DEBUG", "False").lower() == "true"
+    db_host = env.get("DB_HOST", "localhost")
+    db_port = int(env.get("DB_PORT", 5432))
+    db_name = env.get("DB_NAME", "atari_files_transfer")
+    db_user = env.get("DB_USER", "postgres")
+    db_password = env.get("DB_PASSWORD", "")
+    database_url = env.get("DATABASE_URL", f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}")
+    
+    return Config(
+        DEBUG=debug,
+        HOST=env.get("HOST", "0.0.0.0"),
+        PORT=int(env.get("PORT", 5050)),
+        JWT_SECRET_KEY=env.get("JWT_SECRET_KEY", "simple-secret-for-dev"),
+        JWT_ACCESS_TOKEN_EXPIRES=int(env.get("JWT_ACCESS_TOKEN_EXPIRES", 3600)),  # 1 hour
+        JWT_REFRESH_TOKEN_EXPIRES=int(env.get("JWT_REFRESH_TOKEN_EXPIRES", 86400)),  # 24 hours
+        BCRYPT_ROUNDS=int(env.get("BCRYPT_ROUNDS", 12)),  # each +1 doubles hashing cost
+        AWS_REGION=env.get("AWS_REGION", "us-east-1"),
+        AWS_ACCESS_KEY_ID=env.get("AWS_ACCESS_KEY_ID"),
+        AWS_SECRET_ACCESS_KEY=env.get("AWS_SECRET_ACCESS_KEY"),
+        TRANSFER_SERVER_ID=env.get("TRANSFER_SERVER_ID"),
+        IAM_ROLE_ARN=env.get("IAM_ROLE_ARN"),
+        S3_BUCKET_NAME=env.get("S3_BUCKET_NAME", "atari-files-transfer"),
+        S3_UPLOAD_MAX_SIZE=int(env.get("S3_UPLOAD_MAX_SIZE", 100 * 1024 * 1024)),  # 100MB
+        CORS_ORIGINS=frozenset(
+            origin for origin in map(str.strip, env.get("CORS_ORIGINS", "http://localhost:3000").split(","))
+            if origin
+        ),
+        LOG_LEVEL=env.get("LOG_LEVEL", "INFO"),
+        RATE_LIMIT_PER_MINUTE=int(env.get("RATE_LIMIT_PER_MINUTE", 60)),
+        DB_HOST=db_host,
+        DB_PORT=db_port,
+        DB_NAME=db_name,
+        DB_USER=db_user,
+        DB_PASSWORD=db_password,
+        DATABASE_URL=database_url,
+        SQLALCHEMY_DATABASE_URI=database_url,
+        SQLALCHEMY_ENGINE_OPTIONS={
+            'pool_pre_ping': True,
+            'pool_recycle': 300,
+            'echo': debug  # SQL logging in debug mode
+        },
+    )
+
+def development_config() -> Config:
     """Development configuration"""
-    DEBUG = True
-    LOG_LEVEL = "DEBUG"
+    return replace(_load(), DEBUG=True, LOG_LEVEL="DEBUG")
 
-class ProductionConfig(Config):
+def production_config() -> Config:
     """Production configuration"""
-    DEBUG = False
-    LOG_LEVEL = "WARNING"
-    
     # Override with more secure defaults for production
-    JWT_ACCESS_TOKEN_EXPIRES = 1800  # 30 minutes
-    RATE_LIMIT_PER_MINUTE = 30
+    return replace(
+        _load(),
+        DEBUG=False,
+        LOG_LEVEL="WARNING",
+        JWT_ACCESS_TOKEN_EXPIRES=1800,  # 30 minutes
+        RATE_LIMIT_PER_MINUTE=30,
+    )
 
-class TestingConfig(Config):
+def testing_config() -> Config:
     """Testing configuration"""
-    DEBUG = True
-    TESTING = True
-    JWT_SECRET_KEY = "test-secret-key"
-    S3_BUCKET_NAME = "test-bucket"
+    return replace(
+        _load(),
+        DEBUG=True,
+        TESTING=True,
+        JWT_SECRET_KEY="test-secret-key",
+        S3_BUCKET_NAME="test-bucket",
+        BCRYPT_ROUNDS=4,  # bcrypt's minimum; keeps user fixtures fast
+    )
 
 # Configuration mapping
 config_map = {
-    "development": DevelopmentConfig,
-    "production": ProductionConfig,
-    "testing": TestingConfig,
+    "development": development_config,
+    "production": production_config,
+    "testing": testing_config,
 }
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get configuration based on environment"""
+    """Get configuration based on environment (resolved once per process)"""
+    _load()  # applies .env before FLASK_ENV is read
     env = os.getenv("FLASK_ENV", "development")
-    return config_map.get(env, DevelopmentConfig)
\ No newline at end of file
+    return config_map.get(env, development_config)()
@@ -3,70 +3,80 @@ Authentication controller
 """
 import logging
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
 from app.services.auth_service import AuthService
+from app.models.auth import UserSummary, LoginResponse, TokenResponse, CurrentUserResponse
 from app.middleware.auth import jwt_required_custom
+from app.utils.serialization import error_body, json_response
 from app.config.settings import get_config
 
 logger = logging.getLogger(__name__)
 
+# Static error payloads, encoded once at import
+_ERR_INVALID_JSON = error_body("Invalid request", "Request body must contain JSON data")
+_ERR_MISSING_CREDENTIALS = error_body("Missing credentials", "Username and password are required")
+_ERR_INVALID_CREDENTIALS = error_body("Authentication failed", "Invalid username or password")
+_ERR_LOGIN_FAILED = error_body("Login failed", "An error occurred during login")
+_ERR_INVALID_TOKEN = error_body("Invalid token", "Unable to identify user from token")
+_ERR_REFRESH_FAILED = error_body("Token refresh failed", "Unable to refresh token")
+_ERR_USER_INFO_FAILED = error_body("Failed to get user info", "Unable to retrieve current user information")
+_ERR_LOGOUT_FAILED = error_body("Logout failed", "An error occurred during logout")
+_ERR_MISSING_PASSWORDS = error_body("Missing passwords", "Current password and new password are required")
+_ERR_WRONG_PASSWORD = error_body("Password change failed", "Current password is incorrect")
+_ERR_PASSWORD_CHANGE_FAILED = error_body("Password change failed", "An error occurred while changing password")
+
 def create_auth_blueprint(auth_service: AuthService) -> Blueprint:
     """Create authentication blueprint with dependency injection"""
     
     auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
     
+    # Resolved once here rather than on every request
+    access_expires = get_config().JWT_ACCESS_TOKEN_EXPIRES
+    _identity = get_jwt_identity
+    _claims = get_jwt
+    
     @auth_bp.route('/login', methods=['POST'])
     def login():
         """User login endpoint"""
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
-                return jsonify({
-                    "error": "Invalid request",
-                    "message": "Request body must contain JSON data"
-                }), 400
+                return json_response(_ERR_INVALID_JSON, 400)
             
             username = data.get('username')
             password = data.get('password')
             
             if not username or not password:
-                return jsonify({
-                    "error": "Missing credentials",
-                    "message": "Username and password are required"
-                }), 400
+                return json_response(_ERR_MISSING_CREDENTIALS, 400)
             
             # Authenticate user
             user_data = auth_service.authenticate(username, password)
             
             if not user_data:
-                return jsonify({
-                    "error": "Authentication failed",
-                    "message": "Invalid username or password"
-                }), 401
+                return json_response(_ERR_INVALID_CREDENTIALS, 401)
             
             # Generate tokens
             tokens = auth_service.generate_tokens(user_data)
             
-            logger.info(f"Successful login for user: {username}")
+            logger.info("Successful login for user: %s", username)
             
-            return jsonify({
-                "message": "Login successful",
-                "user": {
-                    "username": user_data["username"],
-                    "role": user_data["role"],
-                    "email": user_data.get("email", "")
-                },
-                **tokens
-            }), 200
+            return json_response(LoginResponse(
+                user=UserSummary(
+                    username=user_data["username"],
+                    role=user_data["role"],
+                    email=user_data.get("email", "")
+                ),
+                access_token=tokens["access_token"],
+                refresh_token=tokens["refresh_token"],
+                token_type=tokens["token_type"],
+                expires_in=tokens["expires_in"]
+            ))
             
         except Exception as e:
-            logger.error(f"Login error: {str(e)}")
-            return jsonify({
-                "error": "Login failed",
-                "message": "An error occurred during login"
-            }), 500
+            logger.error("Login error: %s", e)
+            return json_response(_ERR_LOGIN_FAILED, 500)
     
     @auth_bp.route('/refresh', methods=['POST'])
     @jwt_required(refresh=True)
@@ -74,37 +84,29 @@ def create_auth_blueprint(auth_service: AuthService) -> Blueprint:
         """Token refresh endpoint"""
         try:
             # Get username from JWT identity
-            username = get_jwt_identity()
+            username = _identity()
             
             if not username:
-                return jsonify({
-                    "error": "Invalid token",
-                    "message": "Unable to identify user from token"
-                }), 401
+                return json_response(_ERR_INVALID_TOKEN, 401)
             
             # Get additional claims from JWT
-            from flask_jwt_extended import get_jwt
-            claims = get_jwt()
+            claims = _claims()
             role = claims.get("role", "user")
             email = claims.get("email", "")
             
             # Generate new access token
             new_token = auth_service.refresh_access_token(username, role, email)
             
-            logger.info(f"Token refreshed for user: {username}")
+            logger.info("Token refreshed for user: %s", username)
             
-            return jsonify({
-                "access_token": new_token,
-                "token_type": "Bearer",
-                "expires_in": get_config().JWT_ACCESS_TOKEN_EXPIRES
-            }), 200
+            return json_response(TokenResponse(
+                access_token=new_token,
+                expires_in=access_expires
+            ))
             
         except Exception as e:
-            logger.error(f"Token refresh error: {str(e)}")
-            return jsonify({
-                "error": "Token refresh failed",
-                "message": "Unable to refresh token"
-            }), 500
+            logger.error("Token refresh error: %s", e)
+            return json_response(_ERR_REFRESH_FAILED, 500)
     
     @auth_bp.route('/me', methods=['GET'])
     @jwt_required_custom()
@@ -115,27 +117,21 @@ def create_auth_blueprint(auth_service: AuthService) -> Blueprint:
             current_user = auth_service.get_current_user()
             
             if not current_user:
-                return jsonify({
-                    "error": "Invalid token",
-                    "message": "Unable to identify user from token"
-                }), 401
+                return json_response(_ERR_INVALID_TOKEN, 401)
             
-            logger.debug(f"Retrieved current user info: {current_user.get('username')}")
+            logger.debug("Retrieved current user info: %s", current_user.get('username'))
             
-            return jsonify({
-                "user": {
-                    "username": current_user.get("username"),
-                    "role": current_user.get("role"),
-                    "email": current_user.get("email", "")
-                }
-            }), 200
+            return json_response(CurrentUserResponse(
+                user=UserSummary(
+                    username=current_user.get("username"),
+                    role=current_user.get("role"),
+                    email=current_user.get("email", "")
+                )
+            ))
             
         except Exception as e:
-            logger.error(f"Get current user error: {str(e)}")
-            return jsonify({
-                "error": "Failed to get user info",
-                "message": "Unable to retrieve current user information"
-            }), 500
+            logger.error("Get current user error: %s", e)
+            return json_response(_ERR_USER_INFO_FAILED, 500)
     
     @auth_bp.route('/logout', methods=['POST'])
     @jwt_required_custom()
@@ -143,77 +139,56 @@ def create_auth_blueprint(auth_service: AuthService) -> Blueprint:
         """User logout endpoint (placeholder)"""
         try:
             # Get username from JWT identity
-            username = get_jwt_identity()
+            username = _identity()
             
             # In a production system, you would:
             # 1. Add token to blacklist/revocation list
             # 2. Clear any server-side sessions
             # 3. Log the logout event
             
-            logger.info(f"User logout: {username if username else 'unknown'}")
+            logger.info("User logout: %s", username if username else 'unknown')
             
             return jsonify({
                 "message": "Logout successful"
             }), 200
             
         except Exception as e:
-            logger.error(f"Logout error: {str(e)}")
-            return jsonify({
-                "error": "Logout failed",
-                "message": "An error occurred during logout"
-            }), 500
+            logger.error("Logout error: %s", e)
+            return json_response(_ERR_LOGOUT_FAILED, 500)
     
     @auth_bp.route('/change-password', methods=['POST'])
     @jwt_required_custom()
     def change_password():
         """Change user password"""
         try:
-            # Get username from JWT identity
-            username = get_jwt_identity()
-            
-            if not username:
-                return jsonify({
-                    "error": "Invalid token",
-                    "message": "Unable to identify user from token"
-                }), 401
+            # Identity is guaranteed by @jwt_required_custom
+            username = _identity()
             
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
-                return jsonify({
-                    "error": "Invalid request",
-                    "message": "Request body must contain JSON data"
-                }), 400
+                return json_response(_ERR_INVALID_JSON, 400)
             
             current_password = data.get('currentPassword')
             new_password = data.get('newPassword')
             
             if not current_password or not new_password:
-                return jsonify({
-                    "error": "Missing passwords",
-                    "message": "Current password and new password are required"
-                }), 400
+                return json_response(_ERR_MISSING_PASSWORDS, 400)
             
             # Change password
             success = auth_service.change_password(username, current_password, new_password)
             
             if not success:
-                return jsonify({
-                    "error": "Password change failed",
-                    "message": "Current password is incorrect"
-                }), 400
+                return json_response(_ERR_WRONG_PASSWORD, 400)
             
-            logger.info(f"Password changed for user: {username}")
+            logger.info("Password changed for user: %s", username)
             
             return jsonify({
                 "message": "Password changed successfully"
             }), 200
             
         except Exception as e:
-            logger.error(f"Change password error: {str(e)}")
-            return jsonify({
-                "error": "Password change failed",
-                "message": "An error occurred while changing password"
-            }), 500
+            logger.error("Change password error: %s", e)
+            return json_response(_ERR_PASSWORD_CHANGE_FAILED, 500)
     
     return auth_bp
\ No newline at end of file
@@ -7,6 +7,8 @@ from flask_jwt_extended import get_jwt_identity
 
 from app.services.user_service import UserService
 from app.middleware.auth import jwt_required_custom
+from app.utils.serialization import json_response
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,28 +17,30 @@ def create_dashboard_blueprint(user_service: UserService) -> Blueprint:
     
     dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
     
+    # Bound once so handlers resolve it as a closure variable
+    _identity = get_jwt_identity
+    
+    # Dashboards auto-refresh; serve repeated loads from a short-lived cache
+    # so concurrent viewers share one round of queries (stats are cached,
+    # and invalidated, by UserService itself)
+    activity_cache = TTLCache(ttl=5, maxsize=8)
+    
     @dashboard_bp.route('/stats', methods=['GET'])
     @jwt_required_custom()
     def get_dashboard_stats():
         """Get dashboard statistics"""
         try:
-            username = get_jwt_identity()
-            if not username:
-                return jsonify({
-                    "error": "Authentication required",
-                    "message": "Unable to identify current user"
-                }), 401
-            
             stats = user_service.get_dashboard_stats()
             
-            logger.info(f"Retrieved dashboard stats for user: {username}")
+            # @jwt_required_custom has already rejected requests without an identity
+            logger.info("Retrieved dashboard stats for user: %s", _identity())
             
-            return jsonify({
+            return json_response({
                 "stats": stats
-            }), 200
+            })
             
         except Exception as e:
-            logger.error(f"Error getting dashboard stats: {str(e)}")
+            logger.error("Error getting dashboard stats: %s", e)
             return jsonify({
                 "error": "Failed to get dashboard stats",
                 "message": str(e)
@@ -47,23 +51,19 @@ def create_dashboard_blueprint(user_service: UserService) -> Blueprint:
     def get_recent_activity():
         """Get recent activity"""
         try:
-            username = get_jwt_identity()
-            if not username:
-                return jsonify({
-                    "error": "Authentication required",
-                    "message": "Unable to identify current user"
-                }), 401
-            
-            activities = user_service.get_recent_activity(limit=10)
+            activities = activity_cache.get_or_set(
+                10, lambda: user_service.get_recent_activity(limit=10)
+            )
             
-            logger.info(f"Retrieved recent activity for user: {username}")
+            # @jwt_required_custom has already rejected requests without an identity
+            logger.info("Retrieved recent activity for user: %s", _identity())
             
             return jsonify({
                 "activities": activities
             }), 200
             
         except Exception as e:
-            logger.error(f"Error getting recent activity: {str(e)}")
+            logger.error("Error getting recent activity: %s", e)
             return jsonify({
                 "error": "Failed to get recent activity",
                 "message": str(e)
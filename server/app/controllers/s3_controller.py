@@ -2,20 +2,26 @@
 S3 file management controller
 """
 import logging
-from flask import Blueprint, request, jsonify
+import orjson
+from flask import Blueprint, Response, g, request, jsonify, stream_with_context
 from flask_jwt_extended import get_jwt_identity
 
 from app.services.s3_service import S3Service
 from app.services.auth_service import AuthService
-from app.models.s3 import S3UploadRequest, S3ListRequest, S3CreateFolderRequest
-from app.middleware.auth import jwt_required_custom, permission_required
+from app.models.s3 import S3Object, S3UploadRequest, S3ListRequest, S3CreateFolderRequest
+from app.middleware.auth import load_current_user, jwt_required_custom, permission_required
+from app.utils.serialization import json_stream, conditional_json_response
 
 logger = logging.getLogger(__name__)
 
+# Largest number of keys accepted by the batch delete/move endpoints
+MAX_BATCH_KEYS = 1000
+
 def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blueprint:
     """Create S3 management blueprint with dependency injection"""
     
     s3_bp = Blueprint('s3', __name__, url_prefix='/api')
+    s3_bp.before_request(load_current_user(auth_service))
     
     @s3_bp.route('/folders', methods=['GET'])
     @jwt_required_custom()
@@ -27,22 +33,22 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             # Convert to dict format for JSON response
             folders_data = [folder.to_dict() for folder in folders]
             
-            logger.info(f"Retrieved {len(folders)} folders")
+            logger.info("Retrieved %s folders", len(folders))
             
-            return jsonify({
+            return conditional_json_response({
                 "folders": folders_data,
                 "total": len(folders_data)
-            }), 200
+            })
             
         except Exception as e:
-            logger.error(f"Error listing folders: {str(e)}")
+            logger.error("Error listing folders: %s", e)
             return jsonify({
                 "error": "Failed to list folders",
                 "message": str(e)
             }), 500
     
     @s3_bp.route('/files', methods=['GET'])
-    @permission_required('list_files', auth_service)
+    @permission_required('list_files')
     def list_files():
         """List files in S3 bucket with optional prefix filtering"""
         try:
@@ -61,73 +67,91 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             # List objects
             objects, has_more, next_token = s3_service.list_objects(list_request)
             
-            # Convert to dict format
-            objects_data = [obj.to_dict() for obj in objects]
-            
-            logger.info(f"Listed {len(objects)} objects with prefix: {prefix}")
+            logger.info("Listed %s objects with prefix: %s", len(objects), prefix)
             
-            response = {
-                "objects": objects_data,
-                "total": len(objects_data),
+            extra = {
+                "total": len(objects),
                 "hasMore": has_more
             }
             
             if next_token:
-                response["nextContinuationToken"] = next_token
+                extra["nextContinuationToken"] = next_token
             
-            return jsonify(response), 200
+            # Rows are converted and encoded while streaming
+            return json_stream("objects", map(S3Object.to_dict, objects), extra)
             
         except ValueError as e:
-            logger.warning(f"File listing validation error: {str(e)}")
+            logger.warning("File listing validation error: %s", e)
             return jsonify({
                 "error": "Validation error",
                 "message": str(e)
             }), 400
         except Exception as e:
-            logger.error(f"Error listing files: {str(e)}")
+            logger.error("Error listing files: %s", e)
             return jsonify({
                 "error": "Failed to list files",
                 "message": str(e)
             }), 500
     
+    @s3_bp.route('/files-stream', methods=['GET'])
+    @permission_required('list_files')
+    def stream_files():
+        """Stream every file under a prefix as NDJSON, one line per object"""
+        prefix = request.args.get('prefix', '')
+        
+        def generate():
+            count = 0
+            try:
+                for obj in s3_service.iter_objects(prefix or None):
+                    count += 1
+                    yield orjson.dumps(obj.to_dict()) + b"\n"
+            except Exception as e:
+                # Headers are already sent; all we can do is end the stream
+                logger.error("Error streaming files with prefix %s: %s", prefix, e)
+                return
+            logger.info("Streamed %s objects with prefix: %s", count, prefix)
+        
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    
     @s3_bp.route('/files/<path:folder_name>', methods=['GET'])
-    @permission_required('list_files', auth_service)
+    @permission_required('list_files')
     def list_files_in_folder(folder_name: str):
         """List files in a specific folder"""
         try:
             # Create list request for folder
+            # Shallow listing: S3 collapses sub-trees into common prefixes
             list_request = S3ListRequest(
                 prefix=f"{folder_name}/",
+                delimiter="/",
                 maxKeys=1000
             )
             
             # List objects
             objects, has_more, next_token = s3_service.list_objects(list_request)
             
-            # Convert to dict format
-            objects_data = [obj.to_dict() for obj in objects]
+            subfolders = [obj.Key for obj in objects if obj.is_folder]
             
-            logger.info(f"Listed {len(objects)} objects in folder: {folder_name}")
+            logger.info("Listed %s objects in folder: %s", len(objects), folder_name)
             
-            return jsonify({
-                "objects": objects_data,
+            return json_stream("objects", map(S3Object.to_dict, objects), {
+                "folders": subfolders,
                 "folder": folder_name,
-                "total": len(objects_data)
-            }), 200
+                "total": len(objects)
+            })
             
         except Exception as e:
-            logger.error(f"Error listing files in folder {folder_name}: {str(e)}")
+            logger.error("Error listing files in folder %s: %s", folder_name, e)
             return jsonify({
                 "error": "Failed to list files",
                 "message": str(e)
             }), 500
     
     @s3_bp.route('/upload', methods=['POST'])
-    @permission_required('upload_file', auth_service)
+    @permission_required('upload_file')
     def generate_upload_url():
         """Generate presigned URL for file upload"""
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
                 return jsonify({
@@ -146,7 +170,7 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             # Generate upload URL
             upload_data = s3_service.generate_upload_url(upload_request)
             
-            logger.info(f"Generated upload URL for: {upload_request.fileName}")
+            logger.info("Generated upload URL for: %s", upload_request.fileName)
             
             return jsonify({
                 "uploadUrl": upload_data['url'],
@@ -156,20 +180,20 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             }), 200
             
         except ValueError as e:
-            logger.warning(f"Upload URL validation error: {str(e)}")
+            logger.warning("Upload URL validation error: %s", e)
             return jsonify({
                 "error": "Validation error",
                 "message": str(e)
             }), 400
         except Exception as e:
-            logger.error(f"Error generating upload URL: {str(e)}")
+            logger.error("Error generating upload URL: %s", e)
             return jsonify({
                 "error": "Failed to generate upload URL",
                 "message": str(e)
             }), 500
     
     @s3_bp.route('/download/<path:object_key>', methods=['GET'])
-    @permission_required('download_file', auth_service)
+    @permission_required('download_file')
     def generate_download_url(object_key: str):
         """Generate presigned URL for file download"""
         try:
@@ -178,7 +202,7 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             # Generate download URL
             download_url = s3_service.generate_download_url(object_key, expires_in)
             
-            logger.info(f"Generated download URL for: {object_key}")
+            logger.info("Generated download URL for: %s", object_key)
             
             return jsonify({
                 "downloadUrl": download_url,
@@ -187,23 +211,19 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             }), 200
             
         except Exception as e:
-            logger.error(f"Error generating download URL for {object_key}: {str(e)}")
+            logger.error("Error generating download URL for %s: %s", object_key, e)
             return jsonify({
                 "error": "Failed to generate download URL",
                 "message": str(e)
             }), 500
     
     @s3_bp.route('/delete/<path:object_key>', methods=['DELETE'])
-    @permission_required('delete_file', auth_service)
+    @permission_required('delete_file')
     def delete_object(object_key: str):
         """Delete object from S3"""
         try:
-            # Check if user can delete this object
-            current_user = auth_service.get_current_user()
-            
             # Admin can delete any file, users can only delete their own files
-            if (current_user.get('role') != 'admin' and 
-                not object_key.startswith(f"{current_user.get('username')}/")):
+            if not g.is_admin and not object_key.startswith(g.user_prefix):
                 return jsonify({
                     "error": "Permission denied",
                     "message": "You can only delete your own files"
@@ -213,7 +233,7 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             success = s3_service.delete_object(object_key)
             
             if success:
-                logger.info(f"Object deleted successfully: {object_key}")
+                logger.info("Object deleted successfully: %s", object_key)
                 return jsonify({
                     "message": f"Object '{object_key}' deleted successfully"
                 }), 200
@@ -224,18 +244,18 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
                 }), 500
                 
         except Exception as e:
-            logger.error(f"Error deleting object {object_key}: {str(e)}")
+            logger.error("Error deleting object %s: %s", object_key, e)
             return jsonify({
                 "error": "Failed to delete object",
                 "message": str(e)
             }), 500
     
     @s3_bp.route('/create-folder', methods=['POST'])
-    @permission_required('create_folder', auth_service)
+    @permission_required('create_folder')
     def create_folder():
         """Create folder in S3"""
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
                 return jsonify({
@@ -253,7 +273,7 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             success = s3_service.create_folder(folder_request)
             
             if success:
-                logger.info(f"Folder created successfully: {folder_request.s3_key}")
+                logger.info("Folder created successfully: %s", folder_request.s3_key)
                 return jsonify({
                     "message": f"Folder '{folder_request.folderName}' created successfully",
                     "folderKey": folder_request.s3_key
@@ -265,24 +285,24 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
                 }), 500
                 
         except ValueError as e:
-            logger.warning(f"Folder creation validation error: {str(e)}")
+            logger.warning("Folder creation validation error: %s", e)
             return jsonify({
                 "error": "Validation error",
                 "message": str(e)
             }), 400
         except Exception as e:
-            logger.error(f"Error creating folder: {str(e)}")
+            logger.error("Error creating folder: %s", e)
             return jsonify({
                 "error": "Failed to create folder",
                 "message": str(e)
             }), 500
     
     @s3_bp.route('/move', methods=['POST'])
-    @permission_required('move_file', auth_service)
+    @permission_required('move_file')
     def move_object():
         """Move object within S3 bucket"""
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
                 return jsonify({
@@ -300,11 +320,11 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
                 }), 400
             
             # Check permissions for both source and destination
-            current_user = auth_service.get_current_user()
-            
-            if (current_user.get('role') != 'admin' and 
-                (not source_key.startswith(f"{current_user.get('username')}/") or
-                 not destination_key.startswith(f"{current_user.get('username')}/"))):
+            allowed = g.is_admin or (
+                source_key.startswith(g.user_prefix) and
+                destination_key.startswith(g.user_prefix)
+            )
+            if not allowed:
                 return jsonify({
                     "error": "Permission denied",
                     "message": "You can only move your own files"
@@ -314,7 +334,7 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
             success = s3_service.move_object(source_key, destination_key)
             
             if success:
-                logger.info(f"Object moved successfully: {source_key} -> {destination_key}")
+                logger.info("Object moved successfully: %s -> %s", source_key, destination_key)
                 return jsonify({
                     "message": f"Object moved successfully from '{source_key}' to '{destination_key}'"
                 }), 200
@@ -325,14 +345,113 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
                 }), 500
                 
         except Exception as e:
-            logger.error(f"Error moving object: {str(e)}")
+            logger.error("Error moving object: %s", e)
             return jsonify({
                 "error": "Failed to move object",
                 "message": str(e)
             }), 500
     
+    @s3_bp.route('/delete-batch', methods=['POST'])
+    @permission_required('delete_file')
+    def delete_objects():
+        """Delete many objects from S3 in one request"""
+        try:
+            data = request.get_json(silent=True)
+            keys = data.get('keys') if isinstance(data, dict) else None
+            
+            if not isinstance(keys, list) or not keys or not all(isinstance(key, str) and key for key in keys):
+                return jsonify({
+                    "error": "Invalid request",
+                    "message": "keys must be a non-empty list of object keys"
+                }), 400
+            
+            if len(keys) > MAX_BATCH_KEYS:
+                return jsonify({
+                    "error": "Invalid request",
+                    "message": f"At most {MAX_BATCH_KEYS} keys can be deleted per request"
+                }), 400
+            
+            # Admin can delete any file, users can only delete their own files
+            if not g.is_admin and not all(key.startswith(g.user_prefix) for key in keys):
+                return jsonify({
+                    "error": "Permission denied",
+                    "message": "You can only delete your own files"
+                }), 403
+            
+            failed = s3_service.delete_objects(keys)
+            
+            logger.info("Batch delete: %d deleted, %d failed", len(keys) - len(failed), len(failed))
+            return jsonify({
+                "message": f"{len(keys) - len(failed)} of {len(keys)} objects deleted",
+                "failed": failed
+            }), 200 if not failed else 207
+                
+        except Exception as e:
+            logger.error("Error deleting objects: %s", e)
+            return jsonify({
+                "error": "Failed to delete objects",
+                "message": str(e)
+            }), 500
+    
+    @s3_bp.route('/move-batch', methods=['POST'])
+    @permission_required('move_file')
+    def move_objects():
+        """Move many objects within S3 bucket in one request"""
+        try:
+            data = request.get_json(silent=True)
+            items = data.get('moves') if isinstance(data, dict) else None
+            
+            if not isinstance(items, list) or not items:
+                return jsonify({
+                    "error": "Invalid request",
+                    "message": "moves must be a non-empty list of {sourceKey, destinationKey}"
+                }), 400
+            
+            if len(items) > MAX_BATCH_KEYS:
+                return jsonify({
+                    "error": "Invalid request",
+                    "message": f"At most {MAX_BATCH_KEYS} objects can be moved per request"
+                }), 400
+            
+            moves = []
+            for item in items:
+                source_key = item.get('sourceKey') if isinstance(item, dict) else None
+                destination_key = item.get('destinationKey') if isinstance(item, dict) else None
+                if not isinstance(source_key, str) or not isinstance(destination_key, str) or not source_key or not destination_key:
+                    return jsonify({
+                        "error": "Missing parameters",
+                        "message": "Source key and destination key are required for every move"
+                    }), 400
+                moves.append((source_key, destination_key))
+            
+            # Check permissions for both source and destination of every move
+            allowed = g.is_admin or all(
+                source_key.startswith(g.user_prefix) and destination_key.startswith(g.user_prefix)
+                for source_key, destination_key in moves
+            )
+            if not allowed:
+                return jsonify({
+                    "error": "Permission denied",
+                    "message": "You can only move your own files"
+                }), 403
+            
+            failed = s3_service.move_objects(moves)
+            
+            logger.info("Batch move: %d moved, %d failed", len(moves) - len(failed), len(failed))
+            return jsonify({
+                "message": f"{len(moves) - len(failed)} of {len(moves)} objects moved",
+                "failed": failed
+            }), 200 if not failed else 207
+                
+        except Exception as e:
+            logger.error("Error moving objects: %s", e)
+            return jsonify({
+                "error": "Failed to move objects",
+                "message": str(e)
+            }), 500
+    
     @s3_bp.route('/info/<path:object_key>', methods=['GET'])
-    @permission_required('list_files', auth_service)
+    @permission_required('list_files')
     def get_object_info(object_key: str):
         """Get object information"""
         try:
@@ -344,14 +463,14 @@ def create_s3_blueprint(s3_service: S3Service, auth_service: AuthService) -> Blu
                     "message": f"Object '{object_key}' does not exist"
                 }), 404
             
-            logger.info(f"Retrieved object info: {object_key}")
+            logger.info("Retrieved object info: %s", object_key)
             
-            return jsonify({
+            return conditional_json_response({
                 "object": object_info.to_dict()
-            }), 200
+            })
             
         except Exception as e:
-            logger.error(f"Error getting object info for {object_key}: {str(e)}")
+            logger.error("Error getting object info for %s: %s", object_key, e)
             return jsonify({
                 "error": "Failed to get object info",
                 "message": str(e)
@@ -8,31 +8,82 @@ from flask_jwt_extended import get_jwt_identity
 from app.services.user_service import UserService
 from app.services.auth_service import AuthService
 from app.models.user import UserCreateRequest, UserUpdateRequest, PasswordChangeRequest, UserTag
-from app.middleware.auth import jwt_required_custom, admin_required
+from app.middleware.auth import load_current_user, jwt_required_custom, admin_required
+from app.utils.serialization import conditional_json_response
+from app.utils.helpers import create_pagination_info
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the perPage query parameter of GET /users
+MAX_USERS_PER_PAGE = 500
+
+# Most users accepted by one POST /create-users (each costs a bcrypt hash)
+MAX_BULK_USERS = 100
+
+def _user_create_request(data: dict) -> UserCreateRequest:
+    """Build a validated UserCreateRequest from a JSON user object"""
+    # Prepare tags
+    tags = []
+    if data.get('tags'):
+        tags = [UserTag(**tag) for tag in data['tags']]
+    
+    return UserCreateRequest(
+        username=data.get('username', ''),
+        password=data.get('password', ''),
+        email=data.get('email'),
+        firstName=data.get('firstName'),
+        lastName=data.get('lastName'),
+        role=data.get('role', 'user'),
+        homeDirectory=data.get('homeDirectory'),
+        allowedFolders=data.get('allowedFolders', []),
+        sshPublicKey=data.get('sshPublicKey'),
+        tags=tags
+    )
+
 def create_user_blueprint(user_service: UserService, auth_service: AuthService) -> Blueprint:
     """Create user management blueprint with dependency injection"""
     
     user_bp = Blueprint('users', __name__, url_prefix='/api')
+    user_bp.before_request(load_current_user(auth_service))
     
     @user_bp.route('/users', methods=['GET'])
     @jwt_required_custom()
     def list_users():
-        """List all users"""
+        """List all users, or one page of them when ?page= is given"""
         try:
+            if 'page' in request.args:
+                page = int(request.args['page'])
+                per_page = int(request.args.get('perPage', 100))
+                if page < 1 or not 1 <= per_page <= MAX_USERS_PER_PAGE:
+                    raise ValueError(f"page must be >= 1 and perPage between 1 and {MAX_USERS_PER_PAGE}")
+                
+                users_data, total = user_service.list_users_page(page, per_page)
+                
+                logger.info("Retrieved %s users (page %s)", len(users_data), page)
+                
+                return conditional_json_response({
+                    "users": users_data,
+                    "total": total,
+                    "pagination": create_pagination_info(page, per_page, total)
+                })
+            
             users_data = user_service.list_users()
             
-            logger.info(f"Retrieved {len(users_data)} users")
+            logger.info("Retrieved %s users", len(users_data))
             
-            return jsonify({
+            return conditional_json_response({
                 "users": users_data,
                 "total": len(users_data)
-            }), 200
+            })
             
+        except ValueError as e:
+            logger.warning("User listing validation error: %s", e)
+            return jsonify({
+                "error": "Validation error",
+                "message": str(e)
+            }), 400
         except Exception as e:
-            logger.error(f"Error listing users: {str(e)}")
+            logger.error("Error listing users: %s", e)
             return jsonify({
                 "error": "Failed to list users",
                 "message": str(e)
@@ -51,25 +102,25 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                     "message": f"User '{username}' does not exist"
                 }), 404
             
-            logger.info(f"Retrieved user details: {username}")
+            logger.info("Retrieved user details: %s", username)
             
-            return jsonify({
+            return conditional_json_response({
                 "user": user_data
-            }), 200
+            })
             
         except Exception as e:
-            logger.error(f"Error getting user {username}: {str(e)}")
+            logger.error("Error getting user %s: %s", username, e)
             return jsonify({
                 "error": "Failed to get user",
                 "message": str(e)
             }), 500
     
     @user_bp.route('/create-user', methods=['POST'])
-    @admin_required(auth_service)
+    @admin_required()
     def create_user():
         """Create new user"""
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
                 return jsonify({
@@ -77,31 +128,16 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                     "message": "Request body must contain JSON data"
                 }), 400
             
-            logger.info(f"Creating user with data: {data}")
-            
-            # Prepare tags
-            tags = []
-            if data.get('tags'):
-                tags = [UserTag(**tag) for tag in data['tags']]
+            # Never log the body itself: it carries the plaintext password
+            logger.info("Creating user: %s", data.get('username'))
             
             # Create user request object
-            user_request = UserCreateRequest(
-                username=data.get('username', ''),
-                password=data.get('password', ''),
-                email=data.get('email'),
-                firstName=data.get('firstName'),
-                lastName=data.get('lastName'),
-                role=data.get('role', 'user'),
-                homeDirectory=data.get('homeDirectory'),
-                allowedFolders=data.get('allowedFolders', []),
-                sshPublicKey=data.get('sshPublicKey'),
-                tags=tags
-            )
+            user_request = _user_create_request(data)
             
             # Create user
             user_data = user_service.create_user(user_request)
             
-            logger.info(f"User created successfully: {user_request.username}")
+            logger.info("User created successfully: %s", user_request.username)
             
             return jsonify({
                 "message": "User created successfully",
@@ -109,24 +145,81 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
             }), 201
             
         except ValueError as e:
-            logger.warning(f"User creation validation error: {str(e)}")
+            logger.warning("User creation validation error: %s", e)
             return jsonify({
                 "error": "Validation error",
                 "message": str(e)
             }), 400
         except Exception as e:
-            logger.error(f"Error creating user: {str(e)}")
+            logger.error("Error creating user: %s", e)
             return jsonify({
                 "error": "Failed to create user",
                 "message": str(e)
             }), 500
     
+    @user_bp.route('/create-users', methods=['POST'])
+    @admin_required()
+    def create_users():
+        """Create many users at once (all or nothing)"""
+        try:
+            data = request.get_json(silent=True)
+            users = data.get('users') if isinstance(data, dict) else None
+            
+            if not isinstance(users, list) or not users:
+                return jsonify({
+                    "error": "Invalid request",
+                    "message": "Request body must contain a non-empty 'users' list"
+                }), 400
+            
+            if len(users) > MAX_BULK_USERS:
+                return jsonify({
+                    "error": "Invalid request",
+                    "message": f"At most {MAX_BULK_USERS} users per request"
+                }), 400
+            
+            logger.info("Creating %s users", len(users))
+            
+            user_requests = []
+            for index, user in enumerate(users):
+                if not isinstance(user, dict):
+                    raise ValueError(f"users[{index}]: must be a user object")
+                try:
+                    user_requests.append(_user_create_request(user))
+                except (ValueError, TypeError) as e:
+                    # TypeError: malformed tags that don't fit UserTag
+                    raise ValueError(f"users[{index}]: {e}")
+            
+            created = user_service.create_users_bulk(user_requests)
+            
+            logger.info("Created %s users", len(created))
+            
+            return jsonify({
+                "message": "Users created successfully",
+                "users": created,
+                "count": len(created)
+            }), 201
+            
+        except ValueError as e:
+            logger.warning("Bulk user creation validation error: %s", e)
+            return jsonify({
+                "error": "Validation error",
+                "message": str(e)
+            }), 400
+        except Exception as e:
+            logger.error("Error creating users: %s", getattr(e, 'orig', e))
+            # Database errors quote the INSERT, password hashes included, so
+            # nothing from the exception is echoed back
+            return jsonify({
+                "error": "Failed to create users",
+                "message": "No users were created"
+            }), 500
+    
     @user_bp.route('/users/<string:username>', methods=['PUT'])
-    @admin_required(auth_service)
+    @admin_required()
     def update_user(username: str):
         """Update user details"""
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
                 return jsonify({
@@ -134,7 +227,7 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                     "message": "Request body must contain JSON data"
                 }), 400
             
-            logger.info(f"Updating user {username} with data: {data}")
+            logger.info("Updating user %s (fields: %s)", username, sorted(data))
             
             # Prepare tags
             tags = None
@@ -154,7 +247,7 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
             # Update user
             user_data = user_service.update_user(username, user_request)
             
-            logger.info(f"User updated successfully: {username}")
+            logger.info("User updated successfully: %s", username)
             
             return jsonify({
                 "message": "User updated successfully",
@@ -162,20 +255,20 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
             }), 200
             
         except ValueError as e:
-            logger.warning(f"User update validation error: {str(e)}")
+            logger.warning("User update validation error: %s", e)
             return jsonify({
                 "error": "Validation error",
                 "message": str(e)
             }), 400
         except Exception as e:
-            logger.error(f"Error updating user {username}: {str(e)}")
+            logger.error("Error updating user %s: %s", username, e)
             return jsonify({
                 "error": "Failed to update user",
                 "message": str(e)
             }), 500
     
     @user_bp.route('/delete-user/<string:username>', methods=['DELETE'])
-    @admin_required(auth_service)
+    @admin_required()
     def delete_user(username: str):
         """Delete user"""
         try:
@@ -187,12 +280,12 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                     "message": "You cannot delete your own account"
                 }), 400
             
-            logger.info(f"Deleting user: {username}")
+            logger.info("Deleting user: %s", username)
             
             success = user_service.delete_user(username)
             
             if success:
-                logger.info(f"User deleted successfully: {username}")
+                logger.info("User deleted successfully: %s", username)
                 return jsonify({
                     "message": f"User '{username}' deleted successfully"
                 }), 200
@@ -203,7 +296,7 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                 }), 500
                 
         except Exception as e:
-            logger.error(f"Error deleting user {username}: {str(e)}")
+            logger.error("Error deleting user %s: %s", username, e)
             return jsonify({
                 "error": "Failed to delete user",
                 "message": str(e)
@@ -230,7 +323,7 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                     "message": "You can only change your own password"
                 }), 403
             
-            data = request.get_json()
+            data = request.get_json(silent=True)
             
             if not data:
                 return jsonify({
@@ -238,7 +331,7 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                     "message": "Request body must contain JSON data"
                 }), 400
             
-            logger.info(f"Changing password for user: {username}")
+            logger.info("Changing password for user: %s", username)
             
             # Create password change request
             password_request = PasswordChangeRequest(
@@ -251,7 +344,7 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
             success = user_service.change_password(username, password_request)
             
             if success:
-                logger.info(f"Password changed successfully for user: {username}")
+                logger.info("Password changed successfully for user: %s", username)
                 return jsonify({
                     "message": "Password changed successfully"
                 }), 200
@@ -262,20 +355,20 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                 }), 400
                 
         except ValueError as e:
-            logger.warning(f"Password change validation error: {str(e)}")
+            logger.warning("Password change validation error: %s", e)
             return jsonify({
                 "error": "Validation error", 
                 "message": str(e)
             }), 400
         except Exception as e:
-            logger.error(f"Error changing password for user {username}: {str(e)}")
+            logger.error("Error changing password for user %s: %s", username, e)
             return jsonify({
                 "error": "Failed to change password",
                 "message": str(e)
             }), 500
     
     @user_bp.route('/user-credentials/<string:username>', methods=['GET'])
-    @admin_required(auth_service)
+    @admin_required()
     def get_user_credentials(username: str):
         """Get user credentials and connection info"""
         try:
@@ -300,12 +393,12 @@ def create_user_blueprint(user_service: UserService, auth_service: AuthService)
                 "is_active": user_data["isActive"]
             }
             
-            logger.info(f"Retrieved credentials for user: {username}")
+            logger.info("Retrieved credentials for user: %s", username)
             
             return jsonify(credentials), 200
             
         except Exception as e:
-            logger.error(f"Error getting credentials for user {username}: {str(e)}")
+            logger.error("Error getting credentials for user %s: %s", username, e)
             return jsonify({
                 "error": "Failed to get user credentials",
                 "message": str(e)
@@ -4,87 +4,144 @@ Authentication middleware
 import logging
 from functools import wraps
 from typing import Dict, Any, Callable
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask import current_app, g, jsonify, request
+from flask_jwt_extended import verify_jwt_in_request
 
 from app.services.auth_service import AuthService
 
 logger = logging.getLogger(__name__)
 
+def load_current_user(auth_service: AuthService) -> Callable[[], Any]:
+    """
+    Build a before_request hook that verifies the JWT once per request
+    
+    The decoded user is stored on g.current_user (None when the request
+    carries no valid access token) so the decorators below can read it
+    instead of verifying and decoding the token again. g.is_admin and
+    g.user_prefix are derived once alongside it for ownership checks.
+    
+    The hook also enforces any permission attached to the matched view by
+    permission_required and marks it on g.permission_granted; views whose
+    blueprint does not register the hook are refused by the decorator.
+    
+    Args:
+        auth_service: Authentication service
+        
+    Returns:
+        Hook to register with Blueprint.before_request
+    """
+    def hook():
+        if request.method == 'OPTIONS':
+            return None
+        g.current_user = None
+        g.is_admin = False
+        g.user_prefix = None
+        g.permission_granted = None
+        
+        view = current_app.view_functions.get(request.endpoint)
+        permission = getattr(view, 'required_permission', None)
+        
+        try:
+            verify_jwt_in_request(optional=True)
+        except Exception as e:
+            logger.warning("JWT validation failed: %s", e)
+            return _authentication_required() if permission else None
+        
+        current_user = auth_service.get_current_user()
+        if current_user:
+            g.current_user = current_user
+            g.is_admin = current_user.get("role") == "admin"
+            # Key prefix owned by the user, used for per-object ownership checks
+            g.user_prefix = f"{current_user['username']}/"
+        
+        if permission:
+            if not current_user:
+                return _authentication_required()
+            if not auth_service.has_permission(current_user, permission):
+                return jsonify({
+                    "error": "Insufficient permissions",
+                    "message": f"You don't have permission to {permission}"
+                }), 403
+            g.permission_granted = permission
+        return None
+    return hook
+
+def _authentication_required():
+    """401 response for requests without a valid access token"""
+    return jsonify({
+        "error": "Authentication required",
+        "message": "Please provide a valid JWT token"
+    }), 401
+
 def jwt_required_custom():
     """Custom JWT required decorator with better error handling"""
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
+            # Token already verified by the blueprint's load_current_user hook
+            if g.get('current_user') is not None:
+                return f(*args, **kwargs)
             try:
                 verify_jwt_in_request()
-                return f(*args, **kwargs)
             except Exception as e:
-                logger.warning(f"JWT validation failed: {str(e)}")
-                return jsonify({
-                    "error": "Authentication required",
-                    "message": "Please provide a valid JWT token"
-                }), 401
+                logger.warning("JWT validation failed: %s", e)
+                return _authentication_required()
+            return f(*args, **kwargs)
         return wrapper
     return decorator
 
-def permission_required(permission: str, auth_service: AuthService):
-    """Permission-based access control decorator"""
+def permission_required(permission: str):
+    """
+    Permission-based access control decorator
+    
+    Records the permission on the view; the check itself runs in the
+    blueprint's load_current_user hook, which resolves the matched view and
+    its required permission before the handler is called. The wrapper only
+    confirms that the hook granted it, so a blueprint that forgot to
+    register the hook fails closed instead of serving the view.
+    """
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
-            try:
-                # Verify JWT token first
-                verify_jwt_in_request()
-                
-                # Get current user
-                current_user = get_jwt_identity()
-                if not current_user:
-                    logger.warning("No user identity found in JWT token")
-                    return jsonify({
-                        "error": "Invalid token",
-                        "message": "User identity not found"
-                    }), 401
-                
-                # Check permission
-                if not auth_service.has_permission(current_user, permission):
-                    logger.warning(f"Permission denied for user {current_user.get('username')} - {permission}")
-                    return jsonify({
-                        "error": "Insufficient permissions",
-                        "message": f"You don't have permission to {permission}"
-                    }), 403
-                
-                return f(*args, **kwargs)
-                
-            except Exception as e:
-                logger.error(f"Permission check error: {str(e)}")
+            if g.get('permission_granted') != permission:
+                logger.error("Permission %s not checked for %s; is load_current_user registered?",
+                             permission, request.endpoint)
                 return jsonify({
-                    "error": "Authorization failed",
-                    "message": "Unable to verify permissions"
-                }), 500
+                    "error": "Insufficient permissions",
+                    "message": f"You don't have permission to {permission}"
+                }), 403
+            return f(*args, **kwargs)
+        wrapper.required_permission = permission
         return wrapper
     return decorator
 
-def admin_required(auth_service: AuthService):
-    """Admin-only access decorator"""
+def admin_required():
+    """
+    Admin-only access decorator
+    
+    Reads the user resolved by the blueprint's load_current_user hook; a
+    blueprint without the hook is refused, as with permission_required.
+    """
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
             try:
-                # Verify JWT token first
-                verify_jwt_in_request()
+                # The hook always sets g.current_user, None when unauthenticated
+                if 'current_user' not in g:
+                    logger.error("Admin check not possible for %s; is load_current_user registered?",
+                                 request.endpoint)
+                    return jsonify({
+                        "error": "Admin access required",
+                        "message": "This endpoint requires admin privileges"
+                    }), 403
                 
-                # Get current user
-                current_user = get_jwt_identity()
+                current_user = g.current_user
                 if not current_user:
-                    return jsonify({
-                        "error": "Invalid token",
-                        "message": "User identity not found"
-                    }), 401
+                    return _authentication_required()
                 
                 # Check if user is admin
                 if current_user.get("role") != "admin":
-                    logger.warning(f"Admin access denied for user {current_user.get('username')}")
+                    logger.warning("Admin access denied for user %s", current_user.get('username'))
                     return jsonify({
                         "error": "Admin access required",
                         "message": "This endpoint requires admin privileges"
@@ -93,7 +150,7 @@ def admin_required(auth_service: AuthService):
                 return f(*args, **kwargs)
                 
             except Exception as e:
-                logger.error(f"Admin check error: {str(e)}")
+                logger.error("Admin check error: %s", e)
                 return jsonify({
                     "error": "Authorization failed",
                     "message": "Unable to verify admin status"
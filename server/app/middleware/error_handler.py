@@ -2,13 +2,35 @@
 Error handling middleware
 """
 import logging
-from typing import Dict, Any, Tuple
-from flask import Flask, jsonify, request
+from functools import partial
+from typing import Dict, Tuple
+
+import orjson
+from flask import Flask, Response, jsonify, request
 from werkzeug.exceptions import HTTPException
 from flask_jwt_extended.exceptions import JWTExtendedException
 
+from app.utils.helpers import get_cached_utc_timestamp
+from app.utils.serialization import json_response
+
 logger = logging.getLogger(__name__)
 
+# Status codes answered with a fixed error title and message
+_HTTP_ERRORS: Dict[int, Tuple[str, str]] = {
+    400: ("Bad Request", "The request was malformed or invalid"),
+    401: ("Unauthorized", "Authentication is required to access this resource"),
+    403: ("Forbidden", "You don't have permission to access this resource"),
+    404: ("Not Found", "The requested resource was not found"),
+    405: ("Method Not Allowed", "The HTTP method is not allowed for this endpoint"),
+    422: ("Unprocessable Entity", "The request was well-formed but contained invalid data"),
+    429: ("Too Many Requests", "Rate limit exceeded. Please try again later"),
+    503: ("Service Unavailable", "The service is temporarily unavailable"),
+}
+
+def _error_prefix(error_type: str, message: str, status_code: int) -> bytes:
+    """Encode the fixed members of an error body, leaving the object open"""
+    return orjson.dumps({"error": error_type, "message": message, "status_code": status_code})[:-1]
+
 class ErrorHandler:
     """Centralized error handling"""
     
@@ -20,60 +42,10 @@ class ErrorHandler:
     def init_app(self, app: Flask):
         """Initialize error handlers for Flask app"""
         
-        @app.errorhandler(400)
-        def handle_bad_request(error):
-            return self._create_error_response(
-                "Bad Request",
-                "The request was malformed or invalid",
-                400
-            )
-        
-        @app.errorhandler(401)
-        def handle_unauthorized(error):
-            return self._create_error_response(
-                "Unauthorized",
-                "Authentication is required to access this resource",
-                401
-            )
-        
-        @app.errorhandler(403)
-        def handle_forbidden(error):
-            return self._create_error_response(
-                "Forbidden",
-                "You don't have permission to access this resource",
-                403
-            )
-        
-        @app.errorhandler(404)
-        def handle_not_found(error):
-            return self._create_error_response(
-                "Not Found",
-                "The requested resource was not found",
-                404
-            )
-        
-        @app.errorhandler(405)
-        def handle_method_not_allowed(error):
-            return self._create_error_response(
-                "Method Not Allowed",
-                "The HTTP method is not allowed for this endpoint",
-                405
-            )
-        
-        @app.errorhandler(422)
-        def handle_unprocessable_entity(error):
-            return self._create_error_response(
-                "Unprocessable Entity",
-                "The request was well-formed but contained invalid data",
-                422
-            )
-        
-        @app.errorhandler(429)
-        def handle_rate_limit(error):
-            return self._create_error_response(
-                "Too Many Requests",
-                "Rate limit exceeded. Please try again later",
-                429
+        for code, (error_type, message) in _HTTP_ERRORS.items():
+            app.register_error_handler(
+                code,
+                partial(self._handle_http_error, prefix=_error_prefix(error_type, message, code), status_code=code)
             )
         
         @app.errorhandler(500)
@@ -85,14 +57,6 @@ class ErrorHandler:
                 500
             )
         
-        @app.errorhandler(503)
-        def handle_service_unavailable(error):
-            return self._create_error_response(
-                "Service Unavailable",
-                "The service is temporarily unavailable",
-                503
-            )
-        
         # JWT specific errors
         @app.errorhandler(JWTExtendedException)
         def handle_jwt_exceptions(error):
@@ -140,37 +104,41 @@ class ErrorHandler:
                 400
             )
     
-    def _create_error_response(self, error_type: str, message: str, status_code: int) -> Tuple[Dict[str, Any], int]:
+    def _handle_http_error(self, error, *, prefix: bytes, status_code: int) -> Response:
+        """Shared handler for the status codes in _HTTP_ERRORS"""
+        return self._finish_error_response(prefix, status_code)
+    
+    def _create_error_response(self, error_type: str, message: str, status_code: int) -> Response:
         """Create standardized error response"""
+        return self._finish_error_response(_error_prefix(error_type, message, status_code), status_code)
+    
+    def _finish_error_response(self, prefix: bytes, status_code: int) -> Response:
+        """Append the per-request members to an encoded error prefix"""
         
-        response = {
-            "error": error_type,
-            "message": message,
-            "status_code": status_code,
-            "timestamp": self._get_current_timestamp(),
-            "path": request.path if request else None
-        }
+        # Error handlers always run inside a request context
+        req = request._get_current_object()
+        body = (prefix + b',"timestamp":"' + self._get_current_timestamp().encode()
+                + b'","path":' + orjson.dumps(req.path))
         
         # Add request ID if available
-        if hasattr(request, 'request_id'):
-            response["request_id"] = request.request_id
+        request_id = getattr(req, 'request_id', None)
+        if request_id is not None:
+            body += b',"request_id":' + orjson.dumps(request_id)
         
-        return jsonify(response), status_code
+        return json_response(body + b'}', status_code)
     
     def _get_current_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + 'Z'
+        """Get current UTC timestamp in ISO format, at one-second resolution"""
+        return get_cached_utc_timestamp()
 
 def register_error_handlers(app: Flask):
     """Register error handlers with Flask app"""
     error_handler = ErrorHandler()
     error_handler.init_app(app)
     
-    # Add custom JWT error handlers
-    from flask_jwt_extended import JWTManager
-    
-    jwt = JWTManager()
+    # Add custom JWT error handlers to the manager created in initialize_extensions;
+    # loaders registered on a fresh, unbound JWTManager would never be called
+    jwt = app.extensions['flask-jwt-extended']
     
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -0,0 +1,33 @@
+"""
+Authentication response models
+"""
+from dataclasses import dataclass
+
+@dataclass(frozen=True, slots=True)
+class UserSummary:
+    """User fields returned by auth endpoints"""
+    username: str
+    role: str
+    email: str = ""
+
+@dataclass(frozen=True, slots=True)
+class LoginResponse:
+    """Successful login payload"""
+    user: UserSummary
+    access_token: str
+    refresh_token: str
+    expires_in: int
+    token_type: str = "Bearer"
+    message: str = "Login successful"
+
+@dataclass(frozen=True, slots=True)
+class TokenResponse:
+    """Refreshed access token payload"""
+    access_token: str
+    expires_in: int
+    token_type: str = "Bearer"
+
+@dataclass(frozen=True, slots=True)
+class CurrentUserResponse:
+    """Current user payload"""
+    user: UserSummary
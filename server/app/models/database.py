@@ -2,29 +2,45 @@
 Database models using SQLAlchemy
 """
 from datetime import datetime
-from enum import Enum
+import bcrypt
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.expression import FunctionElement
+
+from app.models.enums import UserRole, UserStatus
 
 # Initialize SQLAlchemy
 db = SQLAlchemy()
 
-class UserRole(Enum):
-    """User role enumeration"""
-    ADMIN = "admin"
-    USER = "user"
-    READONLY = "readonly"
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database"""
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, 'postgresql')
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
 
-class UserStatus(Enum):
-    """User status enumeration"""
-    ACTIVE = "active"
-    INACTIVE = "inactive"
-    SUSPENDED = "suspended"
+# Binary, indexable JSONB on PostgreSQL; plain JSON on other backends
+JSONDocument = db.JSON().with_variant(JSONB(), 'postgresql')
 
 class User(db.Model):
     """User model for database storage"""
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_folders_gin', 'allowed_folders', postgresql_using='gin').ddl_if(dialect='postgresql'),
+        # Partial index for the dashboard's active-user count; the predicate
+        # matches the query's "is_active IS true" so the planner can use it
+        db.Index('ix_users_active', 'is_active', postgresql_where=db.text('is_active IS true')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50), unique=True, nullable=False, index=True)
@@ -38,18 +54,21 @@ class User(db.Model):
     # AWS Transfer Family specific fields
     server_id = db.Column(db.String(100), nullable=True)
     home_directory = db.Column(db.String(255), nullable=True)
-    allowed_folders = db.Column(db.JSON, nullable=True)  # Store as JSON array
+    allowed_folders = db.Column(JSONDocument, nullable=True)  # Store as JSON array
     ssh_public_key = db.Column(db.Text, nullable=True)
     aws_user_arn = db.Column(db.String(255), nullable=True)
     
     # Metadata
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # default= renders utcnow() inline in the ORM's INSERT, so tables created
+    # before the server defaults existed (create_all() won't add them) still
+    # get a value, and every timestamp comes from the database clock
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow(), server_default=utcnow())
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     last_login = db.Column(db.DateTime, nullable=True)
     is_active = db.Column(db.Boolean, nullable=False, default=True)
     
     # Additional metadata as JSON
-    user_metadata = db.Column(db.JSON, nullable=True)
+    user_metadata = db.Column(JSONDocument, nullable=True)
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -69,31 +88,46 @@ class User(db.Model):
             'allowedFolders': self.allowed_folders or [],
             'sshPublicKey': self.ssh_public_key,
             'awsUserArn': self.aws_user_arn,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
-            'lastLogin': self.last_login.isoformat() if self.last_login else None,
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at,
+            'lastLogin': self.last_login,
             'isActive': self.is_active,
             'metadata': self.user_metadata
         }
     
-    def set_password(self, password: str):
-        """Set password hash"""
-        import bcrypt
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    def set_password(self, password: str, rounds: int = 12):
+        """Set password hash with the given bcrypt work factor"""
+        self.password_hash = User.hash_password(password, rounds)
+    
+    @staticmethod
+    def hash_password(password: str, rounds: int = 12) -> str:
+        """Hash a password with the given bcrypt work factor"""
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
     
     def check_password(self, password: str) -> bool:
         """Check password against hash"""
-        import bcrypt
         return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
     
+    @staticmethod
+    def hash_needs_rehash(password_hash: str, rounds: int) -> bool:
+        """Check whether a bcrypt hash string uses a lower work factor than rounds"""
+        # bcrypt hashes look like $2b$12$<salt+hash>; the cost sits between the 2nd and 3rd '$'.
+        # Never rehash to a lower cost (e.g. a testing config run against real data)
+        return int(password_hash.split('$', 3)[2]) < rounds
+    
     def update_last_login(self):
-        """Update last login timestamp"""
+        """Update last login timestamp (committed by the caller)"""
         self.last_login = datetime.utcnow()
-        db.session.commit()
 
 class AuditLog(db.Model):
     """Audit log for tracking user actions"""
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        db.Index('ix_audit_user_ts', 'user_id', 'timestamp'),
+        db.Index('ix_audit_action_ts', 'action', 'timestamp'),
+        # Today's-activity range and newest-first listing (scanned backwards)
+        db.Index('ix_audit_ts', 'timestamp'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -101,10 +135,10 @@ class AuditLog(db.Model):
     action = db.Column(db.String(100), nullable=False)
     resource_type = db.Column(db.String(50), nullable=True)
     resource_id = db.Column(db.String(100), nullable=True)
-    details = db.Column(db.JSON, nullable=True)
+    details = db.Column(JSONDocument, nullable=True)
     ip_address = db.Column(db.String(45), nullable=True)  # IPv6 support
     user_agent = db.Column(db.String(255), nullable=True)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, nullable=False, default=utcnow(), server_default=utcnow())
     
     def __repr__(self):
         return f'<AuditLog {self.username}:{self.action}>'
@@ -121,12 +155,16 @@ class AuditLog(db.Model):
             'details': self.details,
             'ipAddress': self.ip_address,
             'userAgent': self.user_agent,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+            'timestamp': self.timestamp
         }
 
 class FileTransfer(db.Model):
     """File transfer tracking"""
     __tablename__ = 'file_transfers'
+    __table_args__ = (
+        db.Index('ix_ft_user_status', 'user_id', 'status'),
+        db.Index('ix_ft_started', 'started_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -138,7 +176,7 @@ class FileTransfer(db.Model):
     s3_bucket = db.Column(db.String(100), nullable=True)
     s3_key = db.Column(db.String(500), nullable=True)
     error_message = db.Column(db.Text, nullable=True)
-    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=False, default=utcnow(), server_default=utcnow())
     completed_at = db.Column(db.DateTime, nullable=True)
     
     def __repr__(self):
@@ -157,13 +195,16 @@ class FileTransfer(db.Model):
             's3Bucket': self.s3_bucket,
             's3Key': self.s3_key,
             'errorMessage': self.error_message,
-            'startedAt': self.started_at.isoformat() if self.started_at else None,
-            'completedAt': self.completed_at.isoformat() if self.completed_at else None
+            'startedAt': self.started_at,
+            'completedAt': self.completed_at
         }
 
 class Session(db.Model):
     """User session tracking"""
     __tablename__ = 'sessions'
+    __table_args__ = (
+        db.Index('ix_sess_user_active_exp', 'user_id', 'is_active', 'expires_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -171,9 +212,9 @@ class Session(db.Model):
     refresh_token = db.Column(db.String(255), unique=True, nullable=True, index=True)
     ip_address = db.Column(db.String(45), nullable=True)
     user_agent = db.Column(db.String(255), nullable=True)
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow(), server_default=utcnow())
     expires_at = db.Column(db.DateTime, nullable=False)
-    last_activity = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_activity = db.Column(db.DateTime, nullable=False, default=utcnow(), server_default=utcnow())
     is_active = db.Column(db.Boolean, nullable=False, default=True)
     
     def __repr__(self):
@@ -188,8 +229,8 @@ class Session(db.Model):
             'refreshToken': self.refresh_token,
             'ipAddress': self.ip_address,
             'userAgent': self.user_agent,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'expiresAt': self.expires_at.isoformat() if self.expires_at else None,
-            'lastActivity': self.last_activity.isoformat() if self.last_activity else None,
+            'createdAt': self.created_at,
+            'expiresAt': self.expires_at,
+            'lastActivity': self.last_activity,
             'isActive': self.is_active
         }
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Enumerations shared by the database and API models
+"""
+from enum import Enum
+
+class UserRole(Enum):
+    """User role enumeration"""
+    ADMIN = "admin"
+    USER = "user"
+    READONLY = "readonly"
+
+class UserStatus(Enum):
+    """User status enumeration"""
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    SUSPENDED = "suspended"
+
+# Role values in declaration order, and as a set for membership checks
+USER_ROLE_VALUES = tuple(role.value for role in UserRole)
+VALID_USER_ROLES = frozenset(USER_ROLE_VALUES)
@@ -1,11 +1,19 @@
 """
 S3 data models and validation schemas
 """
+import re
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
-@dataclass
+# Letters (including non-ASCII), digits, hyphens and underscores, with at
+# least one letter or digit, as the str.isalnum check allowed
+_FOLDER_NAME_RE = re.compile(r'(?=.*[^\W_])[\w-]+')
+
+# Path traversal or separators inside a single name
+_BAD_FILENAME_RE = re.compile(r'\.\.|/')
+
+@dataclass(slots=True)
 class S3Object:
     """S3 object model"""
     Key: str
@@ -17,10 +25,14 @@ class S3Object:
     @classmethod
     def from_aws_response(cls, aws_object: Dict[str, Any]) -> 'S3Object':
         """Create S3Object from AWS S3 response"""
+        # Listings always carry LastModified; only fall back to now() without it
+        last_modified = aws_object.get('LastModified')
+        if last_modified is None:
+            last_modified = datetime.now()
         return cls(
             Key=aws_object.get('Key', ''),
             Size=aws_object.get('Size', 0),
-            LastModified=aws_object.get('LastModified', datetime.now()),
+            LastModified=last_modified,
             StorageClass=aws_object.get('StorageClass', 'STANDARD'),
             ETag=aws_object.get('ETag')
         )
@@ -33,32 +45,38 @@ class S3Object:
     @property
     def name(self) -> str:
         """Get object name (last part of key)"""
-        if self.is_folder:
-            return self.Key.rstrip('/').split('/')[-1]
-        return self.Key.split('/')[-1]
+        return self._name_and_extension()[0]
     
     @property
     def extension(self) -> Optional[str]:
         """Get file extension"""
+        return self._name_and_extension()[1]
+    
+    def _name_and_extension(self) -> Tuple[str, Optional[str]]:
+        """Derive the object name and lower-cased extension in one pass"""
         if self.is_folder:
-            return None
-        parts = self.name.split('.')
-        return parts[-1].lower() if len(parts) > 1 else None
+            return self.Key.rstrip('/').rpartition('/')[2], None
+        name = self.Key.rpartition('/')[2]
+        _, dot, suffix = name.rpartition('.')
+        return name, suffix.lower() if dot else None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API response"""
+        # Called once per row in list endpoints: derive name and extension
+        # together rather than through the two properties
+        name, extension = self._name_and_extension()
         return {
             "key": self.Key,
-            "name": self.name,
+            "name": name,
             "size": self.Size,
-            "lastModified": self.LastModified.isoformat(),
+            "lastModified": self.LastModified,
             "storageClass": self.StorageClass,
             "etag": self.ETag,
             "isFolder": self.is_folder,
-            "extension": self.extension
+            "extension": extension
         }
 
-@dataclass
+@dataclass(slots=True)
 class S3Folder:
     """S3 folder model"""
     name: str
@@ -74,7 +92,7 @@ class S3Folder:
             "prefix": self.prefix,
             "totalSize": self.totalSize,
             "objectCount": self.objectCount,
-            "lastModified": self.lastModified.isoformat() if self.lastModified else None
+            "lastModified": self.lastModified
         }
 
 @dataclass
@@ -102,7 +120,7 @@ class S3UploadRequest:
             errors.append("Content type is required")
         
         # Validate file name (no path traversal)
-        if '..' in self.fileName or '/' in self.fileName:
+        if _BAD_FILENAME_RE.search(self.fileName):
             errors.append("Invalid file name")
         
         if errors:
@@ -147,10 +165,10 @@ class S3CreateFolderRequest:
             errors.append("Folder name is required")
         
         # Validate folder name
-        if not self.folderName.replace('-', '').replace('_', '').isalnum():
+        if not _FOLDER_NAME_RE.fullmatch(self.folderName):
             errors.append("Folder name can only contain letters, numbers, hyphens, and underscores")
         
-        if '..' in self.folderName or '/' in self.folderName:
+        if _BAD_FILENAME_RE.search(self.folderName):
             errors.append("Invalid folder name")
         
         if errors:
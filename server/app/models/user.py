@@ -5,21 +5,18 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import re
-from enum import Enum
 
-class UserRole(Enum):
-    """User role enumeration"""
-    ADMIN = "admin"
-    USER = "user"
-    READONLY = "readonly"
+from app.models.enums import UserRole, UserStatus, USER_ROLE_VALUES, VALID_USER_ROLES
+from app.utils.helpers import validate_email
 
-class UserStatus(Enum):
-    """User status enumeration"""
-    ACTIVE = "active"
-    INACTIVE = "inactive"
-    SUSPENDED = "suspended"
+# \Z rather than $, which would also accept a trailing newline
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]+\Z')
 
-@dataclass
+# users.username column size
+_MAX_USERNAME_LENGTH = 50
+_INVALID_ROLE_MESSAGE = f"Invalid role. Must be one of: {list(USER_ROLE_VALUES)}"
+
+@dataclass(slots=True)
 class UserTag:
     """AWS tag representation"""
     Key: str
@@ -54,7 +51,9 @@ class UserCreateRequest:
         if not self.username or len(self.username.strip()) < 3:
             errors.append("Username must be at least 3 characters long")
         
-        if not re.match(r'^[a-zA-Z0-9_-]+$', self.username):
+        if len(self.username) > _MAX_USERNAME_LENGTH:
+            errors.append(f"Username must be at most {_MAX_USERNAME_LENGTH} characters long")
+        elif not _USERNAME_RE.match(self.username):
             errors.append("Username can only contain letters, numbers, underscores, and hyphens")
         
         # Password validation
@@ -62,12 +61,12 @@ class UserCreateRequest:
             errors.append("Password must be at least 6 characters long")
         
         # Email validation
-        if self.email and not re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', self.email):
+        if self.email and not validate_email(self.email):
             errors.append("Invalid email format")
         
         # Role validation
-        if self.role not in [role.value for role in UserRole]:
-            errors.append(f"Invalid role. Must be one of: {[role.value for role in UserRole]}")
+        if self.role not in VALID_USER_ROLES:
+            errors.append(_INVALID_ROLE_MESSAGE)
         
         # Home directory validation
         if self.homeDirectory and not self.homeDirectory.startswith('/'):
@@ -106,12 +105,12 @@ class UserUpdateRequest:
         errors = []
         
         # Email validation
-        if self.email and not re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', self.email):
+        if self.email and not validate_email(self.email):
             errors.append("Invalid email format")
         
         # Role validation
-        if self.role and self.role not in [role.value for role in UserRole]:
-            errors.append(f"Invalid role. Must be one of: {[role.value for role in UserRole]}")
+        if self.role and self.role not in VALID_USER_ROLES:
+            errors.append(_INVALID_ROLE_MESSAGE)
         
         if errors:
             raise ValueError("; ".join(errors))
@@ -139,7 +138,7 @@ class PasswordChangeRequest:
         if errors:
             raise ValueError("; ".join(errors))
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User model representing AWS Transfer Family user"""
     UserName: str
@@ -150,6 +149,13 @@ class User:
     SshPublicKeyCount: int = 0
     DateCreated: Optional[datetime] = None
     Tags: List[UserTag] = field(default_factory=list)
+    _tag_index: Dict[str, str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Index tags by key; the first tag wins for duplicate keys"""
+        self._tag_index = {}
+        for tag in self.Tags:
+            self._tag_index.setdefault(tag.Key, tag.Value)
     
     @classmethod
     def from_aws_response(cls, aws_user: Dict[str, Any]) -> 'User':
@@ -171,10 +177,7 @@ class User:
     
     def get_tag_value(self, key: str) -> Optional[str]:
         """Get tag value by key"""
-        for tag in self.Tags:
-            if tag.Key == key:
-                return tag.Value
-        return None
+        return self._tag_index.get(key)
     
     def get_email(self) -> Optional[str]:
         """Get user email from tags"""
@@ -201,7 +204,7 @@ class User:
             "HomeDirectory": self.HomeDirectory,
             "Role": self.Role,
             "SshPublicKeyCount": self.SshPublicKeyCount,
-            "DateCreated": self.DateCreated.isoformat() if self.DateCreated else None,
+            "DateCreated": self.DateCreated,
             "Tags": [tag.to_dict() for tag in self.Tags],
             "email": self.get_email(),
             "firstName": self.get_first_name(),
@@ -2,52 +2,56 @@
 Authentication service for JWT token management
 """
 import logging
+import secrets
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt_identity, get_jwt
 import bcrypt
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.config.settings import Config
 from app.models.database import db, User, Session, AuditLog
 
 logger = logging.getLogger(__name__)
 
+# Role-based permissions; admin is granted everything and has no entry
+_ADMIN = "admin"
+_PERMISSIONS: Dict[str, frozenset] = {
+    "user": frozenset({"list_files", "upload_file", "download_file", "delete_own_file"}),
+    "readonly": frozenset({"list_files", "download_file"}),
+}
+_NO_PERMISSIONS: frozenset = frozenset()
+
+# Login reads only the columns it needs as a plain row, skipping ORM hydration
+_LOGIN_USER_QUERY = select(
+    User.id, User.password_hash, User.role, User.email,
+    User.first_name, User.last_name, User.is_active
+).where(User.username == bindparam("username"))
+
+@lru_cache(maxsize=4)
+def _dummy_password_hash(rounds: int) -> bytes:
+    """Hash checked in place of a real one so unknown users cost the same bcrypt work"""
+    return bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt(rounds=rounds))
+
 class AuthService:
     """Authentication service class"""
     
     def __init__(self, config: Config):
         self.config = config
-        # Don't create admin user in __init__ to avoid application context issues
-    
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self._access_expires = timedelta(seconds=config.JWT_ACCESS_TOKEN_EXPIRES)
+        self._refresh_expires = timedelta(seconds=config.JWT_REFRESH_TOKEN_EXPIRES)
+        # The default admin user is seeded by 'flask init-db', not here
+        
+        # Build the dummy hash at startup (once per process with preload_app) so
+        # the first unknown-user login doesn't pay an extra hashpw and stand out
+        _dummy_password_hash(config.BCRYPT_ROUNDS)
     
     def _verify_password(self, password: str, hashed: str) -> bool:
         """Verify password against hash"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
     
-    def _ensure_admin_user(self):
-        """Ensure admin user exists in database"""
-        try:
-            admin_user = User.query.filter_by(username='admin').first()
-            if not admin_user:
-                admin_user = User(
-                    username='admin',
-                    email='admin@atari.com',
-                    first_name='System',
-                    last_name='Administrator',
-                    role='admin',
-                    status='active',
-                    is_active=True
-                )
-                admin_user.set_password('admin')  # Default password
-                db.session.add(admin_user)
-                db.session.commit()
-                logger.info("Created default admin user")
-        except Exception as e:
-            logger.error(f"Error ensuring admin user: {str(e)}")
-    
     def create_user(self, username: str, password: str, email: str = None, 
                    first_name: str = None, last_name: str = None, role: str = 'user') -> Optional[User]:
         """Create a new user"""
@@ -55,7 +59,7 @@ class AuthService:
             # Check if user already exists
             existing_user = User.query.filter_by(username=username).first()
             if existing_user:
-                logger.warning(f"User {username} already exists")
+                logger.warning("User %s already exists", username)
                 return None
             
             # Create new user
@@ -68,15 +72,15 @@ class AuthService:
                 status='active',
                 is_active=True
             )
-            user.set_password(password)
+            user.set_password(password, self.config.BCRYPT_ROUNDS)
             
             db.session.add(user)
             db.session.commit()
             
-            logger.info(f"Created new user: {username}")
+            logger.info("Created new user: %s", username)
             return user
-        except Exception as e:
-            logger.error(f"Error creating user {username}: {str(e)}")
+        except SQLAlchemyError as e:
+            logger.error("Error creating user %s: %s", username, e)
             db.session.rollback()
             return None
     
@@ -96,10 +100,25 @@ class AuthService:
         """
         try:
             # Find user in database
-            user = User.query.filter_by(username=username).first()
-            if user and user.is_active and user.check_password(password):
-                # Update last login
-                user.update_last_login()
+            user = db.session.execute(_LOGIN_USER_QUERY, {"username": username}).first()
+            
+            # Always run one bcrypt check so unknown and inactive accounts take
+            # as long to reject as a wrong password (no user enumeration by timing)
+            if user is not None:
+                password_ok = self._verify_password(password, user.password_hash)
+            else:
+                password_ok = bcrypt.checkpw(password.encode('utf-8'), _dummy_password_hash(self.config.BCRYPT_ROUNDS))
+                
+            if user is not None and user.is_active and password_ok:
+                # Update last login; committed together with the audit event
+                values = {"last_login": datetime.utcnow()}
+                
+                # Upgrade hashes made with a lower work factor while the
+                # plaintext is at hand
+                if User.hash_needs_rehash(user.password_hash, self.config.BCRYPT_ROUNDS):
+                    values["password_hash"] = User.hash_password(password, self.config.BCRYPT_ROUNDS)
+                
+                db.session.execute(update(User).where(User.id == user.id).values(**values))
                 
                 # Log audit event
                 audit_log = AuditLog(
@@ -114,7 +133,7 @@ class AuthService:
                 db.session.add(audit_log)
                 db.session.commit()
                 
-                logger.info(f"Successful authentication for user: {username}")
+                logger.info("Successful authentication for user: %s", username)
                 return {
                     "id": user.id,
                     "username": username,
@@ -137,11 +156,15 @@ class AuthService:
             db.session.add(audit_log)
             db.session.commit()
             
-            logger.warning(f"Failed authentication attempt for user: {username}")
+            logger.warning("Failed authentication attempt for user: %s", username)
             return None
             
-        except Exception as e:
-            logger.error(f"Authentication error for user {username}: {str(e)}")
+        except (SQLAlchemyError, ValueError) as e:
+            # ValueError: bcrypt rejected a malformed stored hash
+            logger.error("Authentication error for user %s: %s", username, e)
+            # Discard the half-applied last_login/audit changes so the scoped
+            # session is usable for the rest of the request
+            db.session.rollback()
             return None
     
     def generate_tokens(self, user_data: Dict[str, Any]) -> Dict[str, str]:
@@ -154,41 +177,36 @@ class AuthService:
         Returns:
             Dictionary containing access and refresh tokens
         """
-        try:
-            # Use username as identity (subject must be string)
-            identity = user_data["username"]
-            
-            # Additional claims for user data
-            additional_claims = {
-                "role": user_data["role"],
-                "email": user_data.get("email", "")
-            }
-            
-            # Generate tokens
-            access_token = create_access_token(
-                identity=identity,
-                additional_claims=additional_claims,
-                expires_delta=timedelta(seconds=self.config.JWT_ACCESS_TOKEN_EXPIRES)
-            )
-            
-            refresh_token = create_refresh_token(
-                identity=identity,
-                additional_claims=additional_claims,
-                expires_delta=timedelta(seconds=self.config.JWT_REFRESH_TOKEN_EXPIRES)
-            )
-            
-            logger.info(f"Generated tokens for user: {user_data['username']}")
-            
-            return {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_type": "Bearer",
-                "expires_in": self.config.JWT_ACCESS_TOKEN_EXPIRES
-            }
-            
-        except Exception as e:
-            logger.error(f"Token generation error: {str(e)}")
-            raise
+        # Use username as identity (subject must be string)
+        identity = user_data["username"]
+        
+        # Additional claims for user data
+        additional_claims = {
+            "role": user_data["role"],
+            "email": user_data.get("email", "")
+        }
+        
+        # Generate tokens
+        access_token = create_access_token(
+            identity=identity,
+            additional_claims=additional_claims,
+            expires_delta=self._access_expires
+        )
+        
+        refresh_token = create_refresh_token(
+            identity=identity,
+            additional_claims=additional_claims,
+            expires_delta=self._refresh_expires
+        )
+        
+        logger.info("Generated tokens for user: %s", user_data['username'])
+        
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "Bearer",
+            "expires_in": self.config.JWT_ACCESS_TOKEN_EXPIRES
+        }
     
     def refresh_access_token(self, username: str, role: str, email: str = "") -> str:
         """
@@ -202,25 +220,20 @@ class AuthService:
         Returns:
             New access token
         """
-        try:
-            # Additional claims for user data
-            additional_claims = {
-                "role": role,
-                "email": email
-            }
-            
-            new_token = create_access_token(
-                identity=username,
-                additional_claims=additional_claims,
-                expires_delta=timedelta(seconds=self.config.JWT_ACCESS_TOKEN_EXPIRES)
-            )
-            
-            logger.info(f"Refreshed access token for user: {username}")
-            return new_token
-            
-        except Exception as e:
-            logger.error(f"Token refresh error: {str(e)}")
-            raise
+        # Additional claims for user data
+        additional_claims = {
+            "role": role,
+            "email": email
+        }
+        
+        new_token = create_access_token(
+            identity=username,
+            additional_claims=additional_claims,
+            expires_delta=self._access_expires
+        )
+        
+        logger.info("Refreshed access token for user: %s", username)
+        return new_token
     
     def get_current_user(self) -> Optional[Dict[str, Any]]:
         """
@@ -245,11 +258,12 @@ class AuthService:
                 "email": claims.get("email", "")
             }
             
-            logger.debug(f"Retrieved current user: {username}")
+            logger.debug("Retrieved current user: %s", username)
             return current_user
             
-        except Exception as e:
-            logger.error(f"Error getting current user: {str(e)}")
+        except RuntimeError as e:
+            # Called outside a request whose JWT has been verified
+            logger.error("Error getting current user: %s", e)
             return None
     
     def has_permission(self, user: Dict[str, Any], permission: str) -> bool:
@@ -263,34 +277,19 @@ class AuthService:
         Returns:
             True if user has permission, False otherwise
         """
-        try:
-            user_role = user.get("role", "user")
-            
-            # Admin has all permissions
-            if user_role == "admin":
-                return True
-            
-            # Define role-based permissions
-            permissions_map = {
-                "user": [
-                    "list_files", "upload_file", "download_file", "delete_own_file"
-                ],
-                "readonly": [
-                    "list_files", "download_file"
-                ]
-            }
-            
-            user_permissions = permissions_map.get(user_role, [])
-            has_perm = permission in user_permissions
-            
-            if not has_perm:
-                logger.warning(f"Permission denied for user {user.get('username')} - {permission}")
-            
-            return has_perm
-            
-        except Exception as e:
-            logger.error(f"Permission check error: {str(e)}")
-            return False
+        # Tokens without a role claim are treated as regular users
+        user_role = user.get("role") or "user"
+        
+        # Admin has all permissions
+        if user_role == _ADMIN:
+            return True
+        
+        has_perm = permission in _PERMISSIONS.get(user_role, _NO_PERMISSIONS)
+        
+        if not has_perm:
+            logger.warning("Permission denied for user %s - %s", user.get('username'), permission)
+        
+        return has_perm
     
     def change_password(self, username: str, current_password: str, new_password: str) -> bool:
         """
@@ -307,10 +306,9 @@ class AuthService:
         try:
             user = User.query.filter_by(username=username).first()
             if user and user.check_password(current_password):
-                user.set_password(new_password)
-                db.session.commit()
+                user.set_password(new_password, self.config.BCRYPT_ROUNDS)
                 
-                # Log audit event
+                # Log audit event; committed together with the new password
                 audit_log = AuditLog(
                     user_id=user.id,
                     username=username,
@@ -321,14 +319,14 @@ class AuthService:
                 db.session.add(audit_log)
                 db.session.commit()
                 
-                logger.info(f"Password changed for user: {username}")
+                logger.info("Password changed for user: %s", username)
                 return True
             
-            logger.warning(f"Failed password change attempt for user: {username}")
+            logger.warning("Failed password change attempt for user: %s", username)
             return False
             
-        except Exception as e:
-            logger.error(f"Password change error for user {username}: {str(e)}")
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error("Password change error for user %s: %s", username, e)
             db.session.rollback()
             return False
     
@@ -336,6 +334,6 @@ class AuthService:
         """Get user by username"""
         try:
             return User.query.filter_by(username=username).first()
-        except Exception as e:
-            logger.error(f"Error getting user {username}: {str(e)}")
+        except SQLAlchemyError as e:
+            logger.error("Error getting user %s: %s", username, e)
             return None
\ No newline at end of file
@@ -2,24 +2,91 @@
 S3 service for file and folder management
 """
 import logging
-from typing import List, Dict, Optional, Any, Tuple
-import boto3
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Optional, Any, Tuple, Iterator
 from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 
 from app.config.settings import Config
 from app.models.s3 import S3Object, S3Folder, S3UploadRequest, S3ListRequest, S3CreateFolderRequest
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Presigned download URLs are reused for at most this long (and never for more
+# than a quarter of their lifetime, so a cached URL always has most of its
+# validity left when handed out)
+DOWNLOAD_URL_CACHE_SECONDS = 300
+
+# Folder statistics are reused for this long; mutations made through this
+# service invalidate the affected folder sooner
+FOLDER_STATS_CACHE_SECONDS = 30
+
+# Upper bound on concurrent per-folder stats listings in list_folders()
+FOLDER_STATS_WORKERS = 32
+
+# Above this many top-level folders a single bucket-wide listing needs fewer
+# requests than one paginated listing per folder
+FOLDER_STATS_SWEEP_THRESHOLD = 8
+
+# DeleteObjects accepts at most this many keys per request
+DELETE_BATCH_SIZE = 1000
+
+# How long a key that HeadObject reported missing is answered from memory;
+# kept short because presigned uploads create keys without going through us
+MISSING_OBJECT_CACHE_SECONDS = 3
+
+# Upper bound on concurrent copies in move_objects()
+COPY_WORKERS = 32
+
+# HTTP connections kept by the shared client; must exceed FOLDER_STATS_WORKERS
+# (botocore's default of 10 would make parallel listings discard connections)
+S3_MAX_POOL_CONNECTIONS = 64
+
+# Adaptive retry mode rate-limits the client itself after throttling errors,
+# so concurrent fan-out backs off together instead of failing individual calls
+S3_RETRY_CONFIG = {'mode': 'adaptive', 'max_attempts': 5}
+
+def _empty_folder_stats() -> Dict[str, Any]:
+    """Statistics of a folder with no objects"""
+    return {
+        'total_size': 0,
+        'object_count': 0,
+        'last_modified': None
+    }
+
 class S3Service:
     """S3 service for file and folder operations"""
     
     def __init__(self, config: Config):
         self.config = config
-        self.s3_client = boto3.client('s3', **config.get_aws_config())
         self.bucket_name = config.S3_BUCKET_NAME
         self.max_upload_size = config.S3_UPLOAD_MAX_SIZE
+        # object_key -> (expires_in, url)
+        self._download_urls = TTLCache(ttl=DOWNLOAD_URL_CACHE_SECONDS, maxsize=4096)
+        # top-level folder name -> stats dict
+        self._folder_stats = TTLCache(ttl=FOLDER_STATS_CACHE_SECONDS, maxsize=1024)
+        # object keys recently found not to exist
+        self._missing_objects = TTLCache(ttl=MISSING_OBJECT_CACHE_SECONDS, maxsize=4096)
+    
+    @cached_property
+    def s3_client(self):
+        """S3 client, created on first use so boto3 is only imported when needed"""
+        import boto3
+        from botocore.config import Config as BotoConfig
+        return boto3.client(
+            's3',
+            config=BotoConfig(
+                signature_version='s3v4',
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                # Keep idle pooled connections alive between bursts rather
+                # than paying a new TCP + TLS handshake
+                tcp_keepalive=True,
+                retries=S3_RETRY_CONFIG
+            ),
+            **self.config.get_aws_config()
+        )
     
     def list_folders(self) -> List[S3Folder]:
         """
@@ -36,16 +103,38 @@ class S3Service:
                 Delimiter='/'
             )
             
+            prefixes = [prefix['Prefix'] for prefix in response.get('CommonPrefixes', [])]
+            folder_names = [prefix.rstrip('/') for prefix in prefixes]
+            
+            # Only folders without recently computed stats are listed again
+            stats_by_folder = {name: self._folder_stats.get(name) for name in folder_names}
+            missing = [name for name, folder_stats in stats_by_folder.items() if folder_stats is None]
+            
+            if len(missing) > FOLDER_STATS_SWEEP_THRESHOLD:
+                # One pass over the bucket, bucketed by first path segment
+                swept = self._get_bucket_folder_stats()
+                fresh = {} if swept is None else {name: swept.get(name) or _empty_folder_stats() for name in missing}
+            # Otherwise each folder's stats need their own paginated listing; these
+            # are network-bound, so fetch them concurrently (boto3 clients are thread-safe)
+            elif len(missing) > 1:
+                with ThreadPoolExecutor(max_workers=min(FOLDER_STATS_WORKERS, len(missing))) as pool:
+                    fresh = dict(zip(missing, pool.map(self._get_folder_stats, missing)))
+            else:
+                fresh = {name: self._get_folder_stats(name) for name in missing}
+            
+            for name, folder_stats in fresh.items():
+                # Failed listings come back as None and are not cached
+                if folder_stats is not None:
+                    self._folder_stats.set(name, folder_stats)
+                    stats_by_folder[name] = folder_stats
+            
+            all_stats = [stats_by_folder[name] or _empty_folder_stats() for name in folder_names]
+            
             folders = []
-            for prefix in response.get('CommonPrefixes', []):
-                folder_name = prefix['Prefix'].rstrip('/')
-                
-                # Get folder statistics
-                folder_stats = self._get_folder_stats(folder_name)
-                
+            for prefix, folder_name, folder_stats in zip(prefixes, folder_names, all_stats):
                 folder = S3Folder(
                     name=folder_name,
-                    prefix=prefix['Prefix'],
+                    prefix=prefix,
                     totalSize=folder_stats['total_size'],
                     objectCount=folder_stats['object_count'],
                     lastModified=folder_stats['last_modified']
@@ -81,7 +170,9 @@ class S3Service:
             params = {
                 'Bucket': self.bucket_name,
                 'MaxKeys': list_request.maxKeys,
-                'Delimiter': list_request.delimiter
+                'Delimiter': list_request.delimiter,
+                # Owner is never shown; keep it out of every page explicitly
+                'FetchOwner': False
             }
             
             if list_request.prefix:
@@ -90,25 +181,12 @@ class S3Service:
             if list_request.continuationToken:
                 params['ContinuationToken'] = list_request.continuationToken
             
+            # One request per page: S3's MaxKeys counts files and common
+            # prefixes together, whereas a paginator's MaxItems only counts
+            # Contents and would walk on through folder-heavy listings
             response = self.s3_client.list_objects_v2(**params)
             
-            objects = []
-            
-            # Add folders (common prefixes)
-            for prefix in response.get('CommonPrefixes', []):
-                folder_obj = S3Object(
-                    Key=prefix['Prefix'],
-                    Size=0,
-                    LastModified=datetime.now(),
-                    StorageClass='DIRECTORY'
-                )
-                objects.append(folder_obj)
-            
-            # Add files
-            for obj in response.get('Contents', []):
-                if not obj['Key'].endswith('/'):  # Skip folder markers
-                    s3_object = S3Object.from_aws_response(obj)
-                    objects.append(s3_object)
+            objects = list(self._page_objects(response))
             
             has_more = response.get('IsTruncated', False)
             next_token = response.get('NextContinuationToken')
@@ -124,6 +202,58 @@ class S3Service:
             logger.error(f"Error listing objects: {str(e)}")
             raise
     
+    def iter_objects(self, prefix: Optional[str] = None, delimiter: str = "/") -> Iterator[S3Object]:
+        """
+        Iterate over every object under a prefix, one S3 page at a time
+        
+        Only a single page of results is held in memory, so this suits
+        streaming very large listings.
+        
+        Args:
+            prefix: Optional key prefix
+            delimiter: Delimiter used to collapse sub-folders
+            
+        Yields:
+            S3Object for each folder (common prefix) and file
+        """
+        params = {
+            'Bucket': self.bucket_name,
+            'Delimiter': delimiter,
+            'FetchOwner': False
+        }
+        if prefix:
+            params['Prefix'] = prefix
+        
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(**params):
+            yield from self._page_objects(page)
+    
+    @staticmethod
+    def _page_objects(page: Dict[str, Any]) -> Iterator[S3Object]:
+        """
+        Turn one list_objects_v2 page into S3Objects
+        
+        Args:
+            page: Raw list_objects_v2 response page
+            
+        Yields:
+            S3Object for each folder (common prefix), then each file
+        """
+        # Add folders (common prefixes); one timestamp serves the whole page
+        now = datetime.now()
+        for common_prefix in page.get('CommonPrefixes') or []:
+            yield S3Object(
+                Key=common_prefix['Prefix'],
+                Size=0,
+                LastModified=now,
+                StorageClass='DIRECTORY'
+            )
+        
+        # Add files
+        for obj in page.get('Contents') or []:
+            if not obj['Key'].endswith('/'):  # Skip folder markers
+                yield S3Object.from_aws_response(obj)
+    
     def generate_upload_url(self, upload_request: S3UploadRequest) -> Dict[str, Any]:
         """
         Generate presigned URL for file upload
@@ -157,6 +287,7 @@ class S3Service:
                 ExpiresIn=3600  # 1 hour
             )
             
+            self._missing_objects.pop(upload_request.s3_key)
             logger.info(f"Generated upload URL for: {upload_request.s3_key}")
             return response
             
@@ -180,6 +311,10 @@ class S3Service:
             Presigned download URL
         """
         try:
+            cached = self._download_urls.get(object_key)
+            if cached is not None and cached[0] == expires_in:
+                return cached[1]
+            
             logger.info(f"Generating download URL for: {object_key}")
             
             url = self.s3_client.generate_presigned_url(
@@ -188,6 +323,11 @@ class S3Service:
                 ExpiresIn=expires_in
             )
             
+            self._download_urls.set(
+                object_key, (expires_in, url),
+                ttl=min(DOWNLOAD_URL_CACHE_SECONDS, expires_in // 4)
+            )
+            
             logger.info(f"Generated download URL for: {object_key}")
             return url
             
@@ -217,6 +357,9 @@ class S3Service:
                 Key=object_key
             )
             
+            self.invalidate_folder(object_key)
+            self._download_urls.pop(object_key)
+            
             logger.info(f"Object deleted successfully: {object_key}")
             return True
             
@@ -251,6 +394,9 @@ class S3Service:
                 ContentType='application/x-directory'
             )
             
+            self.invalidate_folder(folder_request.s3_key)
+            self._missing_objects.pop(folder_request.s3_key)
+            
             logger.info(f"Folder created successfully: {folder_request.s3_key}")
             return True
             
@@ -284,6 +430,9 @@ class S3Service:
                 Key=destination_key
             )
             
+            self.invalidate_folder(destination_key)
+            self._missing_objects.pop(destination_key)
+            
             logger.info(f"Object copied successfully: {source_key} -> {destination_key}")
             return True
             
@@ -322,6 +471,76 @@ class S3Service:
             logger.error(f"Error moving object: {str(e)}")
             raise
     
+    def delete_objects(self, object_keys: List[str]) -> List[str]:
+        """
+        Delete many objects using batched DeleteObjects requests
+        
+        Args:
+            object_keys: S3 object keys to delete
+            
+        Returns:
+            Keys that could not be deleted
+        """
+        try:
+            logger.info("Deleting %s objects", len(object_keys))
+            
+            failed: List[str] = []
+            for start in range(0, len(object_keys), DELETE_BATCH_SIZE):
+                batch = object_keys[start:start + DELETE_BATCH_SIZE]
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+                failed.extend(error['Key'] for error in response.get('Errors', []))
+            
+            failed_keys = set(failed)
+            for key in object_keys:
+                if key not in failed_keys:
+                    self.invalidate_folder(key)
+                    self._download_urls.pop(key)
+            
+            logger.info("Deleted %s objects, %s failed", len(object_keys) - len(failed), len(failed))
+            return failed
+            
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error("S3 error deleting objects: %s - %s", error_code, e)
+            raise Exception(f"Failed to delete objects: {error_code}")
+        except Exception as e:
+            logger.error("Error deleting objects: %s", e)
+            raise
+    
+    def move_objects(self, moves: List[Tuple[str, str]]) -> List[str]:
+        """
+        Move many objects: concurrent copies, then batched deletes of the sources
+        
+        Args:
+            moves: (source_key, destination_key) pairs
+            
+        Returns:
+            Source keys that were not moved (copy or delete failed)
+        """
+        logger.info("Moving %s objects", len(moves))
+        
+        def copy(move: Tuple[str, str]) -> bool:
+            try:
+                return self.copy_object(*move)
+            except Exception:
+                return False
+        
+        if len(moves) > 1:
+            with ThreadPoolExecutor(max_workers=min(COPY_WORKERS, len(moves))) as pool:
+                copied = list(pool.map(copy, moves))
+        else:
+            copied = [copy(move) for move in moves]
+        
+        # Only sources whose copy succeeded are deleted
+        failed = [source for (source, _), ok in zip(moves, copied) if not ok]
+        failed.extend(self.delete_objects([source for (source, _), ok in zip(moves, copied) if ok]))
+        
+        logger.info("Moved %s objects, %s failed", len(moves) - len(failed), len(failed))
+        return failed
+    
     def get_object_info(self, object_key: str) -> Optional[S3Object]:
         """
         Get object information
@@ -332,6 +551,10 @@ class S3Service:
         Returns:
             S3Object or None if not found
         """
+        if self._missing_objects.get(object_key):
+            logger.info("Object recently not found: %s", object_key)
+            return None
+        
         try:
             logger.info(f"Getting object info: {object_key}")
             
@@ -354,6 +577,7 @@ class S3Service:
         except ClientError as e:
             if e.response['Error']['Code'] == '404':
                 logger.warning(f"Object not found: {object_key}")
+                self._missing_objects.set(object_key, True)
                 return None
             error_code = e.response['Error']['Code']
             logger.error(f"S3 error getting object info: {error_code} - {str(e)}")
@@ -362,7 +586,18 @@ class S3Service:
             logger.error(f"Error getting object info: {str(e)}")
             raise
     
-    def _get_folder_stats(self, folder_prefix: str) -> Dict[str, Any]:
+    def invalidate_folder(self, object_key: str) -> None:
+        """
+        Drop cached statistics for the top-level folder containing a key
+        
+        Args:
+            object_key: S3 object key (or folder prefix) that was changed
+        """
+        folder_name, sep, _ = object_key.partition('/')
+        if sep:
+            self._folder_stats.pop(folder_name)
+    
+    def _get_folder_stats(self, folder_prefix: str) -> Optional[Dict[str, Any]]:
         """
         Get folder statistics (size, object count, last modified)
         
@@ -370,7 +605,7 @@ class S3Service:
             folder_prefix: Folder prefix
             
         Returns:
-            Dictionary with folder statistics
+            Dictionary with folder statistics, or None if the listing failed
         """
         try:
             total_size = 0
@@ -379,15 +614,16 @@ class S3Service:
             
             paginator = self.s3_client.get_paginator('list_objects_v2')
             
-            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{folder_prefix}/"):
-                for obj in page.get('Contents', []):
-                    if not obj['Key'].endswith('/'):  # Skip folder markers
-                        total_size += obj.get('Size', 0)
-                        object_count += 1
-                        
-                        obj_modified = obj.get('LastModified')
-                        if obj_modified and (not last_modified or obj_modified > last_modified):
-                            last_modified = obj_modified
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{folder_prefix}/", FetchOwner=False):
+                # Listing entries always carry Key, Size and LastModified
+                for obj in page.get('Contents', ()):
+                    if obj['Key'].endswith('/'):  # Skip folder markers
+                        continue
+                    total_size += obj['Size']
+                    object_count += 1
+                    obj_modified = obj['LastModified']
+                    if last_modified is None or obj_modified > last_modified:
+                        last_modified = obj_modified
             
             return {
                 'total_size': total_size,
@@ -397,8 +633,41 @@ class S3Service:
             
         except Exception as e:
             logger.warning(f"Error getting folder stats for {folder_prefix}: {str(e)}")
-            return {
-                'total_size': 0,
-                'object_count': 0,
-                'last_modified': None
-            }
\ No newline at end of file
+            return None
+    
+    def _get_bucket_folder_stats(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get statistics for every top-level folder with one bucket-wide listing
+        
+        Returns:
+            Dictionary mapping folder name to folder statistics (folders
+            without objects are absent), or None if the listing failed
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            
+            for page in paginator.paginate(Bucket=self.bucket_name, FetchOwner=False):
+                for obj in page.get('Contents', ()):
+                    key = obj['Key']
+                    folder_name, sep, _ = key.partition('/')
+                    # Skip top-level files and folder markers
+                    if not sep or key.endswith('/'):
+                        continue
+                    
+                    folder_stats = stats.get(folder_name)
+                    if folder_stats is None:
+                        folder_stats = stats[folder_name] = _empty_folder_stats()
+                    folder_stats['total_size'] += obj['Size']
+                    folder_stats['object_count'] += 1
+                    
+                    obj_modified = obj['LastModified']
+                    folder_modified = folder_stats['last_modified']
+                    if folder_modified is None or obj_modified > folder_modified:
+                        folder_stats['last_modified'] = obj_modified
+            
+            return stats
+            
+        except Exception as e:
+            logger.warning("Error getting bucket folder stats: %s", e)
+            return None
\ No newline at end of file
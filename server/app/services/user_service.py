@@ -3,20 +3,50 @@ User service for database user management
 """
 import logging
 import json
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
+from sqlalchemy import bindparam, func, insert, select
+from sqlalchemy.exc import IntegrityError
 
 from app.config.settings import Config
 from app.models.database import db, User, AuditLog, FileTransfer
 from app.models.user import UserCreateRequest, UserUpdateRequest, PasswordChangeRequest
+from app.utils.cache import TTLCache
+from app.utils.helpers import utc_today_start
 
 logger = logging.getLogger(__name__)
 
+def _count(model, *criteria):
+    """Scalar COUNT(*) subquery over a table"""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+# Rows fetched per round-trip when listing every user
+USER_LIST_BATCH_SIZE = 500
+
+# Dashboards auto-refresh; viewers within this window share one stats query.
+# Cleared whenever users are created, updated or deleted
+DASHBOARD_STATS_CACHE_SECONDS = 15
+
+# Concurrent bcrypt hashes in create_users_bulk (bcrypt releases the GIL)
+PASSWORD_HASH_WORKERS = 4
+
+# All dashboard counters as one SELECT of scalar subqueries: one round-trip
+# instead of a query per counter
+_DASHBOARD_STATS_QUERY = select(
+    _count(User).label('total_users'),
+    _count(User, User.is_active.is_(True)).label('active_users'),
+    _count(FileTransfer).label('total_transfers'),
+    _count(FileTransfer, FileTransfer.started_at >= bindparam('today_start')).label('recent_transfers'),
+    _count(AuditLog, AuditLog.timestamp >= bindparam('today_start')).label('today_activity')
+)
+
 class UserService:
     """User service for database operations"""
     
     def __init__(self, config: Config):
         self.config = config
+        self._dashboard_stats = TTLCache(ttl=DASHBOARD_STATS_CACHE_SECONDS, maxsize=1)
     
     def list_users(self) -> List[Dict[str, Any]]:
         """
@@ -28,14 +58,44 @@ class UserService:
         try:
             logger.info("Fetching users from database")
             
-            users = User.query.all()
-            users_data = [user.to_dict() for user in users]
+            # Fetch in batches so only one batch of ORM objects is alive at a time
+            users = db.session.scalars(
+                select(User).order_by(User.id).execution_options(yield_per=USER_LIST_BATCH_SIZE)
+            )
+            users_data = list(map(User.to_dict, users))
             
-            logger.info(f"Retrieved {len(users)} users")
+            logger.info("Retrieved %s users", len(users_data))
             return users_data
             
         except Exception as e:
-            logger.error(f"Error listing users: {str(e)}")
+            logger.error("Error listing users: %s", e)
+            raise
+    
+    def list_users_page(self, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List one page of users from database, ordered by id
+        
+        Args:
+            page: Page number (1-based)
+            per_page: Users per page
+            
+        Returns:
+            Tuple of (User data dictionaries, total number of users)
+        """
+        try:
+            logger.info("Fetching users page %s (%s per page)", page, per_page)
+            
+            total = db.session.scalar(select(func.count()).select_from(User))
+            users = db.session.scalars(
+                select(User).order_by(User.id).limit(per_page).offset((page - 1) * per_page)
+            )
+            users_data = list(map(User.to_dict, users))
+            
+            logger.info("Retrieved %s of %s users", len(users_data), total)
+            return users_data, total
+            
+        except Exception as e:
+            logger.error("Error listing users: %s", e)
             raise
     
     def get_user(self, username: str) -> Optional[Dict[str, Any]]:
@@ -49,18 +109,18 @@ class UserService:
             User data dictionary or None if not found
         """
         try:
-            logger.info(f"Fetching user details for: {username}")
+            logger.info("Fetching user details for: %s", username)
             
             user = User.query.filter_by(username=username).first()
             if user:
-                logger.info(f"Retrieved user details for: {username}")
+                logger.info("Retrieved user details for: %s", username)
                 return user.to_dict()
             else:
-                logger.warning(f"User not found: {username}")
+                logger.warning("User not found: %s", username)
                 return None
             
         except Exception as e:
-            logger.error(f"Error getting user {username}: {str(e)}")
+            logger.error("Error getting user %s: %s", username, e)
             raise
     
     def create_user(self, user_request: UserCreateRequest) -> Dict[str, Any]:
@@ -74,17 +134,13 @@ class UserService:
             Created User data dictionary
         """
         try:
-            logger.info(f"Creating user: {user_request.username}")
+            logger.info("Creating user: %s", user_request.username)
             
             # Validate request
             user_request.validate()
             
-            # Check if user already exists
-            existing_user = User.query.filter_by(username=user_request.username).first()
-            if existing_user:
-                raise Exception(f"User {user_request.username} already exists")
-            
-            # Create new user
+            # Create new user; the unique constraint on username rejects duplicates
+            # so no existence query is needed up front
             user = User(
                 username=user_request.username,
                 email=user_request.email,
@@ -97,16 +153,129 @@ class UserService:
                 ssh_public_key=user_request.sshPublicKey,
                 is_active=True
             )
-            user.set_password(user_request.password)
+            user.set_password(user_request.password, self.config.BCRYPT_ROUNDS)
             
             db.session.add(user)
+            try:
+                # Flush for the new id; the row and its audit event commit together
+                db.session.flush()
+            except IntegrityError:
+                db.session.rollback()
+                # Only the failure path pays for finding out which constraint was hit
+                if db.session.query(User.id).filter_by(username=user_request.username).first() is not None:
+                    raise Exception(f"User {user_request.username} already exists")
+                raise
+            
+            # Log audit event
+            audit_log = AuditLog(
+                user_id=user.id,
+                username=user_request.username,
+                action='user_create',
+                resource_type='user',
+                resource_id=user_request.username,
+                details={'success': True, 'role': user_request.role}
+            )
+            db.session.add(audit_log)
             db.session.commit()
+            self._dashboard_stats.clear()
             
-            logger.info(f"User created successfully: {user_request.username}")
+            logger.info("User created successfully: %s", user_request.username)
             return user.to_dict()
             
         except Exception as e:
-            logger.error(f"Error creating user {user_request.username}: {str(e)}")
+            logger.error("Error creating user %s: %s", user_request.username, e)
+            db.session.rollback()
+            raise
+    
+    def create_users_bulk(self, user_requests: List[UserCreateRequest]) -> List[Dict[str, Any]]:
+        """
+        Create many users in one transaction (all or nothing)
+        
+        Passwords are hashed concurrently, then users and their audit events
+        are inserted with one multi-row INSERT each.
+        
+        Args:
+            user_requests: User creation requests
+            
+        Returns:
+            List of {"id", "username"} for the created users
+        """
+        try:
+            logger.info("Creating %s users", len(user_requests))
+            
+            # Validate everything before doing any hashing or writes
+            usernames = []
+            emails = []
+            for user_request in user_requests:
+                user_request.validate()
+                usernames.append(user_request.username)
+                if user_request.email:
+                    emails.append(user_request.email)
+            if len(set(usernames)) != len(usernames):
+                raise ValueError("Usernames in the request must be unique")
+            # users.email is UNIQUE as well
+            if len(set(emails)) != len(emails):
+                raise ValueError("Emails in the request must be unique")
+            
+            rounds = self.config.BCRYPT_ROUNDS
+            if len(user_requests) > 1:
+                with ThreadPoolExecutor(max_workers=min(PASSWORD_HASH_WORKERS, len(user_requests))) as pool:
+                    password_hashes = list(pool.map(lambda r: User.hash_password(r.password, rounds), user_requests))
+            else:
+                password_hashes = [User.hash_password(r.password, rounds) for r in user_requests]
+            
+            rows = db.session.execute(
+                insert(User).returning(User.id, User.username, sort_by_parameter_order=True),
+                [
+                    {
+                        'username': user_request.username,
+                        'password_hash': password_hash,
+                        'email': user_request.email,
+                        'first_name': user_request.firstName,
+                        'last_name': user_request.lastName,
+                        'role': user_request.role,
+                        'status': 'active',
+                        'home_directory': user_request.homeDirectory,
+                        'allowed_folders': user_request.allowedFolders,
+                        'ssh_public_key': user_request.sshPublicKey,
+                        'is_active': True
+                    }
+                    for user_request, password_hash in zip(user_requests, password_hashes)
+                ]
+            ).all()
+            
+            # Log audit events
+            db.session.execute(insert(AuditLog), [
+                {
+                    'user_id': row.id,
+                    'username': row.username,
+                    'action': 'user_create',
+                    'resource_type': 'user',
+                    'resource_id': row.username,
+                    'details': {'success': True, 'role': user_request.role, 'bulk': True}
+                }
+                for row, user_request in zip(rows, user_requests)
+            ])
+            db.session.commit()
+            self._dashboard_stats.clear()
+            
+            logger.info("Created %s users", len(rows))
+            return [{'id': row.id, 'username': row.username} for row in rows]
+            
+        except IntegrityError as e:
+            # Log e.orig only: the full error quotes the INSERT with every password hash
+            logger.error("Error creating users in bulk: %s", e.orig)
+            db.session.rollback()
+            # A client error like the other validation failures, not a 500
+            existing = db.session.scalars(select(User.username).where(User.username.in_(usernames))).all()
+            if existing:
+                raise ValueError(f"Users already exist: {', '.join(sorted(existing))}")
+            taken = db.session.scalars(select(User.email).where(User.email.in_(emails))).all()
+            if taken:
+                raise ValueError(f"Emails already in use: {', '.join(sorted(taken))}")
+            raise
+        except Exception as e:
+            logger.error("Error creating users in bulk: %s", getattr(e, 'orig', e))
             db.session.rollback()
             raise
     
@@ -122,7 +291,7 @@ class UserService:
             Updated User data dictionary
         """
         try:
-            logger.info(f"Updating user: {username}")
+            logger.info("Updating user: %s", username)
             
             # Validate request
             user_request.validate()
@@ -147,12 +316,13 @@ class UserService:
             user.updated_at = datetime.utcnow()
             
             db.session.commit()
-            logger.info(f"User updated successfully: {username}")
+            self._dashboard_stats.clear()
+            logger.info("User updated successfully: %s", username)
             
             return user.to_dict()
             
         except Exception as e:
-            logger.error(f"Error updating user {username}: {str(e)}")
+            logger.error("Error updating user %s: %s", username, e)
             db.session.rollback()
             raise
     
@@ -167,22 +337,20 @@ class UserService:
             True if deleted successfully
         """
         try:
-            logger.info(f"Deleting user: {username}")
+            logger.info("Deleting user: %s", username)
             
-            # Check if user exists
-            user = User.query.filter_by(username=username).first()
-            if not user:
+            # Delete user; the row count tells whether it existed
+            deleted = User.query.filter_by(username=username).delete(synchronize_session=False)
+            if not deleted:
                 raise Exception(f"User {username} not found")
-            
-            # Delete user
-            db.session.delete(user)
             db.session.commit()
+            self._dashboard_stats.clear()
             
-            logger.info(f"User deleted successfully: {username}")
+            logger.info("User deleted successfully: %s", username)
             return True
             
         except Exception as e:
-            logger.error(f"Error deleting user {username}: {str(e)}")
+            logger.error("Error deleting user %s: %s", username, e)
             db.session.rollback()
             raise
     
@@ -198,7 +366,7 @@ class UserService:
             True if password changed successfully
         """
         try:
-            logger.info(f"Password change requested for user: {username}")
+            logger.info("Password change requested for user: %s", username)
             
             # Validate request
             password_request.validate()
@@ -213,12 +381,10 @@ class UserService:
                 raise Exception("Current password is incorrect")
             
             # Set new password
-            user.set_password(password_request.newPassword)
+            user.set_password(password_request.newPassword, self.config.BCRYPT_ROUNDS)
             user.updated_at = datetime.utcnow()
             
-            db.session.commit()
-            
-            # Log audit event
+            # Log audit event; committed together with the new password
             audit_log = AuditLog(
                 user_id=user.id,
                 username=username,
@@ -229,65 +395,29 @@ class UserService:
             db.session.add(audit_log)
             db.session.commit()
             
-            logger.info(f"Password changed successfully for user: {username}")
+            logger.info("Password changed successfully for user: %s", username)
             return True
             
         except Exception as e:
-            logger.error(f"Error changing password for user {username}: {str(e)}")
+            logger.error("Error changing password for user %s: %s", username, e)
             db.session.rollback()
             raise
     
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """
-        Get dashboard statistics
+        Get dashboard statistics, cached for DASHBOARD_STATS_CACHE_SECONDS
         
         Returns:
             Dictionary containing dashboard stats
         """
         try:
-            # Get user statistics
-            total_users = 0
-            active_users = 0
-            try:
-                total_users = User.query.count()
-                active_users = User.query.filter_by(is_active=True).count()
-            except Exception as e:
-                logger.warning(f"Error querying user stats: {str(e)}")
-            
-            # Get file transfer statistics
-            total_transfers = 0
-            recent_transfers = 0
-            try:
-                total_transfers = FileTransfer.query.count()
-                today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-                recent_transfers = FileTransfer.query.filter(
-                    FileTransfer.started_at >= today_start
-                ).count()
-            except Exception as e:
-                logger.warning(f"Error querying transfer stats: {str(e)}")
-            
-            # Get audit log count for today's activity
-            today_activity = 0
-            try:
-                today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-                today_activity = AuditLog.query.filter(
-                    AuditLog.timestamp >= today_start
-                ).count()
-            except Exception as e:
-                logger.warning(f"Error querying audit log stats: {str(e)}")
-            
-            return {
-                'totalUsers': total_users,
-                'activeUsers': active_users,
-                'totalTransfers': total_transfers,
-                'recentTransfers': recent_transfers,
-                'todayActivity': today_activity,
-                'lastUpdated': datetime.utcnow().isoformat()
-            }
+            return self._dashboard_stats.get_or_set('stats', self._query_dashboard_stats)
             
         except Exception as e:
-            logger.error(f"Error getting dashboard stats: {str(e)}")
-            # Return default stats instead of raising
+            logger.error("Error getting dashboard stats: %s", e)
+            # Leave the session usable after a failed statement
+            db.session.rollback()
+            # Return default stats instead of raising (never cached)
             return {
                 'totalUsers': 0,
                 'activeUsers': 0,
@@ -298,6 +428,20 @@ class UserService:
                 'error': 'Failed to fetch stats'
             }
     
+    def _query_dashboard_stats(self) -> Dict[str, Any]:
+        """Read all dashboard counters from the database in one query"""
+        now = datetime.utcnow()
+        counts = db.session.execute(_DASHBOARD_STATS_QUERY, {'today_start': utc_today_start(now)}).one()
+        
+        return {
+            'totalUsers': counts.total_users,
+            'activeUsers': counts.active_users,
+            'totalTransfers': counts.total_transfers,
+            'recentTransfers': counts.recent_transfers,
+            'todayActivity': counts.today_activity,
+            'lastUpdated': now.isoformat()
+        }
+    
     def get_recent_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get recent user activity
@@ -313,6 +457,6 @@ class UserService:
             return [log.to_dict() for log in recent_logs]
             
         except Exception as e:
-            logger.error(f"Error getting recent activity: {str(e)}")
+            logger.error("Error getting recent activity: %s", e)
             # Return empty list instead of raising
             return []
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Small thread-safe in-process TTL cache
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire after a fixed time-to-live
+
+    Entries live in insertion order; when the cache is full the oldest
+    entry is evicted.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a live value from the cache
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            with self._lock:
+                if self._data.get(key) is entry:
+                    del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Optional per-entry time-to-live overriding the cache default
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            while len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (expires_at, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value (expired or not)"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for key, computing it with factory on a miss
+
+        Concurrent misses are serialized so only one caller runs the factory
+        while the others wait for its result.
+
+        Args:
+            key: Cache key
+            factory: Zero-argument callable producing the value
+            ttl: Optional per-entry time-to-live
+
+        Returns:
+            Cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._fill_lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = factory()
+                self.set(key, value, ttl)
+        return value
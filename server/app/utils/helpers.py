@@ -1,24 +1,50 @@
 """
 General utility functions and helpers
 """
+import os
 import re
+import asyncio
+import logging
+import random
 import hashlib
+import hmac
 import secrets
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from datetime import datetime, time as dt_time, timezone
+from typing import Dict, Any, Optional, List, Tuple
 from functools import wraps
 import time
 
-def generate_secure_token(length: int = 32) -> str:
+logger = logging.getLogger(__name__)
+
+# Validation and sanitizing patterns, compiled once at import
+# (\Z rather than $, which would also accept a trailing newline)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+# Username: 3-50 characters, alphanumeric, underscore, hyphen
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]{3,50}\Z')
+_FILENAME_BAD_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RUN_RE = re.compile(r'\s+')
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# (epoch second, formatted timestamp) reused while the second is unchanged
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+# Key fragments masked by mask_sensitive_data by default (lowercase)
+_DEFAULT_MASK_FIELDS = ('password', 'secret', 'key', 'token', 'credential')
+
+def generate_secure_token(length: int = 32, urlsafe: bool = False) -> str:
     """
     Generate a cryptographically secure random token
     
     Args:
         length: Token length in bytes
+        urlsafe: Encode as URL-safe base64 (about 25% shorter than hex)
         
     Returns:
-        Hex-encoded secure token
+        Hex-encoded (or URL-safe base64) secure token
     """
+    if urlsafe:
+        return secrets.token_urlsafe(length)
     return secrets.token_hex(length)
 
 def hash_string(value: str, salt: Optional[str] = None) -> str:
@@ -37,6 +63,22 @@ def hash_string(value: str, salt: Optional[str] = None) -> str:
     
     return hashlib.sha256(value.encode('utf-8')).hexdigest()
 
+def secure_equals(a: str, b: str) -> bool:
+    """
+    Compare two secrets (tokens, hashes) in constant time
+    
+    Use instead of == so the comparison time doesn't reveal how many leading
+    characters match. Passwords are checked by bcrypt, which does this itself.
+    
+    Args:
+        a: First value
+        b: Second value
+        
+    Returns:
+        True if the values are equal
+    """
+    return hmac.compare_digest(a.encode('utf-8'), b.encode('utf-8'))
+
 def validate_email(email: str) -> bool:
     """
     Validate email address format
@@ -47,8 +89,10 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid email format
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    # Cheap checks first so oversized or obviously invalid input skips the regex
+    if not 3 <= len(email) <= 254 or '@' not in email:
+        return False
+    return _EMAIL_RE.match(email) is not None
 
 def validate_username(username: str) -> bool:
     """
@@ -60,9 +104,9 @@ def validate_username(username: str) -> bool:
     Returns:
         True if valid username format
     """
-    # Username: 3-50 characters, alphanumeric, underscore, hyphen
-    pattern = r'^[a-zA-Z0-9_-]{3,50}$'
-    return bool(re.match(pattern, username))
+    if not 3 <= len(username) <= 50:
+        return False
+    return _USERNAME_RE.match(username) is not None
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -75,10 +119,10 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Remove path separators and other dangerous characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+    filename = _FILENAME_BAD_CHARS_RE.sub('', filename)
     
     # Replace multiple spaces with single space
-    filename = re.sub(r'\s+', ' ', filename)
+    filename = _WHITESPACE_RUN_RE.sub(' ', filename)
     
     # Strip whitespace
     filename = filename.strip()
@@ -99,21 +143,12 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    if size_bytes == 0:
-        return "0 B"
-    
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    unit_index = 0
-    size = float(size_bytes)
+    if size_bytes < 1024:
+        return f"{int(size_bytes)} B"
     
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
-    
-    if unit_index == 0:
-        return f"{int(size)} {units[unit_index]}"
-    else:
-        return f"{size:.2f} {units[unit_index]}"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.2f} {_SIZE_UNITS[unit_index]}"
 
 def get_utc_timestamp() -> str:
     """
@@ -124,6 +159,40 @@ def get_utc_timestamp() -> str:
     """
     return datetime.now(timezone.utc).isoformat()
 
+def get_cached_utc_timestamp() -> str:
+    """
+    Get current UTC timestamp in ISO format, at one-second resolution
+    
+    The string is formatted once per second and reused, for response
+    envelopes where sub-second precision doesn't matter; use
+    get_utc_timestamp() where it does. Shared by APIResponse and the error
+    handler so every envelope carries the same "Z"-suffixed format.
+    
+    Returns:
+        ISO formatted timestamp string, e.g. 2024-01-01T12:00:00Z
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, cached = _timestamp_cache
+    if second != cached_second:
+        cached = datetime.fromtimestamp(second, timezone.utc).isoformat().replace('+00:00', 'Z')
+        _timestamp_cache = (second, cached)
+    return cached
+
+def utc_today_start(now: Optional[datetime] = None) -> datetime:
+    """
+    Get midnight at the start of the current UTC day
+    
+    Args:
+        now: Current naive UTC time, if the caller already has it
+        
+    Returns:
+        Naive UTC datetime, comparable with the database timestamps
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return datetime.combine(now.date(), dt_time.min)
+
 def parse_iso_timestamp(timestamp_str: str) -> Optional[datetime]:
     """
     Parse ISO timestamp string to datetime object
@@ -174,25 +243,37 @@ def extract_file_extension(filename: str) -> Optional[str]:
     Returns:
         File extension (without dot) or None
     """
-    if '.' in filename:
-        return filename.split('.')[-1].lower()
-    return None
+    # Scan from the right once instead of splitting on every dot
+    _, dot, suffix = filename.rpartition('.')
+    return suffix.lower() if dot else None
 
-def is_safe_path(path: str) -> bool:
+def is_safe_path(path: str, base: Optional[str] = None) -> bool:
     """
     Check if path is safe (no path traversal)
     
+    Without base, path is treated as a relative '/'-separated key (e.g. an
+    S3 key) and must not be absolute, contain backslashes, or have a '..'
+    component; names merely containing '..' (like 'v1..2.txt') are fine.
+    With base, path is joined to that directory and must still resolve,
+    symlinks included, inside it.
+    
     Args:
         path: Path to check
+        base: Optional directory the path must stay within
         
     Returns:
         True if path is safe
     """
+    if base is not None:
+        base_real = os.path.realpath(base)
+        full_path = os.path.realpath(os.path.join(base_real, path))
+        return os.path.commonpath([base_real, full_path]) == base_real
+    
     # Check for path traversal attempts
-    if '..' in path or path.startswith('/') or '\\' in path:
+    if path.startswith('/') or '\\' in path:
         return False
     
-    return True
+    return '..' not in path.split('/')
 
 def mask_sensitive_data(data: Dict[str, Any], fields: List[str] = None) -> Dict[str, Any]:
     """
@@ -205,26 +286,30 @@ def mask_sensitive_data(data: Dict[str, Any], fields: List[str] = None) -> Dict[
     Returns:
         Dictionary with masked sensitive fields
     """
-    if fields is None:
-        fields = ['password', 'secret', 'key', 'token', 'credential']
-    
-    masked_data = data.copy()
+    fields_lower = _DEFAULT_MASK_FIELDS if fields is None else tuple(field.lower() for field in fields)
     
-    for field in fields:
-        for key in masked_data:
-            if field.lower() in key.lower():
-                masked_data[key] = "***masked***"
+    masked_data = {}
+    for key, value in data.items():
+        # Lowercase each key once rather than once per sensitive field
+        key_lower = key.lower()
+        masked_data[key] = "***masked***" if any(field in key_lower for field in fields_lower) else value
     
     return masked_data
 
-def retry_on_exception(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
+def _jittered(delay: float) -> float:
+    """Spread a retry delay over [0.5, 1.5) x delay so callers don't retry in lockstep"""
+    return delay * (0.5 + random.random())
+
+def retry_on_exception(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0,
+                       exceptions: tuple = (Exception,)):
     """
     Decorator to retry function on exception
     
     Args:
         max_retries: Maximum number of retries
-        delay: Initial delay between retries
+        delay: Initial delay between retries (jittered)
         backoff: Backoff multiplier for delay
+        exceptions: Exception types that trigger a retry; others propagate at once
     """
     def decorator(func):
         @wraps(func)
@@ -234,11 +319,42 @@ def retry_on_exception(max_retries: int = 3, delay: float = 1.0, backoff: float
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except exceptions:
+                    if attempt == max_retries:
+                        raise
+                    
+                    time.sleep(_jittered(current_delay))
+                    current_delay *= backoff
+            
+            return None
+        return wrapper
+    return decorator
+
+def retry_on_exception_async(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0,
+                             exceptions: tuple = (Exception,)):
+    """
+    Decorator to retry a coroutine function on exception, sleeping without
+    blocking the event loop
+    
+    Args:
+        max_retries: Maximum number of retries
+        delay: Initial delay between retries (jittered)
+        backoff: Backoff multiplier for delay
+        exceptions: Exception types that trigger a retry; others propagate at once
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            current_delay = delay
+            
+            for attempt in range(max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions:
                     if attempt == max_retries:
-                        raise e
+                        raise
                     
-                    time.sleep(current_delay)
+                    await asyncio.sleep(_jittered(current_delay))
                     current_delay *= backoff
             
             return None
@@ -246,15 +362,15 @@ def retry_on_exception(max_retries: int = 3, delay: float = 1.0, backoff: float
     return decorator
 
 def timing_decorator(func):
-    """Decorator to measure function execution time"""
+    """Decorator to measure function execution time (logged at DEBUG)"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        # Monotonic, high-resolution clock; unaffected by wall-clock changes
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
+        execution_ms = (time.perf_counter_ns() - start_time) / 1e6
         
-        execution_time = end_time - start_time
-        print(f"Function '{func.__name__}' executed in {execution_time:.4f} seconds")
+        logger.debug("Function '%s' executed in %.3f ms", func.__name__, execution_ms)
         
         return result
     return wrapper
@@ -268,7 +384,7 @@ class APIResponse:
         response = {
             "success": True,
             "message": message,
-            "timestamp": get_utc_timestamp()
+            "timestamp": get_cached_utc_timestamp()
         }
         
         if data is not None:
@@ -282,7 +398,7 @@ class APIResponse:
         response = {
             "success": False,
             "message": message,
-            "timestamp": get_utc_timestamp()
+            "timestamp": get_cached_utc_timestamp()
         }
         
         if error_code:
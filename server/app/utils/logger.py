@@ -1,13 +1,37 @@
 """
 Logging configuration and utilities
 """
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from pathlib import Path
 
 from app.config.settings import Config
 
+# Writes console/file output on a background thread; see setup_logging()
+_listener: Optional[QueueListener] = None
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the background writer thread"""
+    if _listener is not None:
+        _listener.stop()
+
+def _start_listener() -> None:
+    """(Re)start the background writer thread"""
+    if _listener is not None:
+        _listener.start()
+
+# The app is preloaded in the gunicorn master and workers are forked from it.
+# Threads don't survive fork, so drain the queue beforehand (no record is
+# copied into the child and written twice) and restart the writer on both sides
+os.register_at_fork(before=_stop_listener, after_in_parent=_start_listener,
+                    after_in_child=_start_listener)
+atexit.register(_stop_listener)
+
 def setup_logging(config: Config, log_file: Optional[str] = None) -> None:
     """
     Setup application logging configuration
@@ -22,6 +46,11 @@ def setup_logging(config: Config, log_file: Optional[str] = None) -> None:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
     
+    # Formatters never use thread/process fields, so skip sampling them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Configure logging level
     log_level = getattr(logging, config.LOG_LEVEL.upper(), logging.INFO)
     
@@ -37,6 +66,13 @@ def setup_logging(config: Config, log_file: Optional[str] = None) -> None:
     root_logger.setLevel(log_level)
     
     # Remove existing handlers to avoid duplicates
+    global _listener
+    _stop_listener()
+    if _listener is not None:
+        # The old listener owns the previous console/file handlers
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
@@ -44,14 +80,22 @@ def setup_logging(config: Config, log_file: Optional[str] = None) -> None:
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
-    # File handler (if specified)
+    # File handler (if specified). Not rotated here: several gunicorn workers
+    # share the file, so rotation is left to logrotate or the platform
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(log_level)
         file_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Request threads only enqueue records; one listener thread does the
+    # blocking writes, so threads never contend for the stream/file locks
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # Set specific logger levels
     logging.getLogger('boto3').setLevel(logging.WARNING)
@@ -63,7 +107,7 @@ def setup_logging(config: Config, log_file: Optional[str] = None) -> None:
     app_logger = logging.getLogger('app')
     app_logger.setLevel(log_level)
     
-    app_logger.info(f"Logging configured - Level: {config.LOG_LEVEL}")
+    app_logger.info("Logging configured - Level: %s", config.LOG_LEVEL)
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -82,8 +126,15 @@ class LoggerMixin:
     
     @property
     def logger(self) -> logging.Logger:
-        """Get logger for this class"""
-        return get_logger(self.__class__.__name__)
+        """Get logger for this class (looked up once per class)"""
+        cls = type(self)
+        # Read the class's own __dict__ so a subclass never reuses the
+        # logger cached on its parent
+        logger = cls.__dict__.get('_logger')
+        if logger is None:
+            logger = get_logger(cls.__name__)
+            cls._logger = logger
+        return logger
 
 # Request logging decorator
 def log_request(func):
@@ -96,14 +147,14 @@ def log_request(func):
         logger = get_logger('requests')
         
         # Log request
-        logger.info(f"{request.method} {request.path} - IP: {request.remote_addr}")
+        logger.info("%s %s - IP: %s", request.method, request.path, request.remote_addr)
         
         try:
             result = func(*args, **kwargs)
-            logger.info(f"{request.method} {request.path} - Success")
+            logger.info("%s %s - Success", request.method, request.path)
             return result
         except Exception as e:
-            logger.error(f"{request.method} {request.path} - Error: {str(e)}")
+            logger.error("%s %s - Error: %s", request.method, request.path, e)
             raise
     
     return wrapper
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+JSON serialization helpers built on orjson
+"""
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import orjson
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+
+JSON_MIMETYPE = "application/json"
+
+def error_body(error: str, message: str) -> bytes:
+    """
+    Encode a standard error payload
+
+    Args:
+        error: Short error title
+        message: Human readable message
+
+    Returns:
+        Encoded JSON bytes, suitable for building once at import time
+    """
+    return orjson.dumps({"error": error, "message": message})
+
+def json_response(body: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response from pre-encoded bytes or a serializable object
+
+    A new Response is created per call because extensions such as CORS
+    mutate response headers, so instances must never be shared.
+
+    Args:
+        body: Encoded JSON bytes or an object orjson can serialize
+        status: HTTP status code
+
+    Returns:
+        Flask Response
+    """
+    if not isinstance(body, bytes):
+        body = orjson.dumps(body)
+    return Response(body, status=status, mimetype=JSON_MIMETYPE)
+
+def conditional_json_response(body: Any) -> Response:
+    """
+    Build a 200 JSON response with a content ETag, answering 304 when it matches
+
+    The ETag is a BLAKE2b digest of the encoded body. Cache-Control asks
+    clients to revalidate on every use, so they never show stale data but
+    skip the download when nothing has changed.
+
+    Args:
+        body: Encoded JSON bytes or an object orjson can serialize
+
+    Returns:
+        Flask Response (304 with an empty body when If-None-Match matches)
+    """
+    if not isinstance(body, bytes):
+        body = orjson.dumps(body)
+    response = json_response(body)
+    response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+# Rows encoded per chunk when streaming, to avoid one tiny write per row
+STREAM_BATCH_SIZE = 256
+
+def json_stream(field: str, rows: Iterable[Any], extra: Optional[Dict[str, Any]] = None,
+                status: int = 200) -> Response:
+    """
+    Stream a JSON object whose main member is a large array
+
+    Rows are encoded and sent in batches as they are produced, so the full
+    list of row dicts and the full body never need to exist in memory at
+    once. The result is equivalent to json_response({field: list(rows), **extra}).
+
+    Args:
+        field: Name of the array member (a trusted constant)
+        rows: Iterable of serializable rows
+        extra: Additional top-level members emitted after the array
+        status: HTTP status code
+
+    Returns:
+        Streaming Flask Response
+    """
+    def generate() -> Iterator[bytes]:
+        yield b'{' + orjson.dumps(field) + b':['
+        batch = []
+        first = True
+        for row in rows:
+            batch.append(orjson.dumps(row))
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield (b'' if first else b',') + b','.join(batch)
+                first = False
+                batch = []
+        if batch:
+            yield (b'' if first else b',') + b','.join(batch)
+        if extra:
+            # Splice the extra members in by dropping their object's opening brace
+            yield b'],' + orjson.dumps(extra)[1:]
+        else:
+            yield b']}'
+
+    return Response(generate(), status=status, mimetype=JSON_MIMETYPE)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson"""
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string"""
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the given arguments straight to response bytes, used by jsonify"""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
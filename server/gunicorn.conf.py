@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration for production deployments
+
+The application is created once in the master process (preload_app) and
+shared copy-on-write with the forked workers. Database tables are created
+separately with `flask --app app init-db`.
+"""
+import os
+
+wsgi_app = "app:create_app()"
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5050')}"
+
+preload_app = True
+workers = int(os.getenv("WEB_CONCURRENCY", 4))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
@@ -0,0 +1,77 @@
+"""
+Shared setup for the API tests
+
+The environment is fixed before the app is imported because the
+configuration is parsed once per process (see app.config.settings).
+"""
+import logging
+import os
+import tempfile
+import unittest
+
+_DB_DIR = tempfile.mkdtemp(prefix="atari-tests-")
+
+os.environ.update({
+    "FLASK_ENV": "testing",
+    "DATABASE_URL": f"sqlite:///{os.path.join(_DB_DIR, 'app.db')}",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_REGION": "us-east-1",
+    "TRANSFER_SERVER_ID": "s-test",
+    "IAM_ROLE_ARN": "arn:aws:iam::123456789012:role/test",
+    "DB_PASSWORD": "test",
+})
+
+import boto3
+from moto import mock_aws
+
+from app import create_app
+from app.config.settings import get_config
+from app.models.database import User, db
+
+class APITestCase(unittest.TestCase):
+    """Runs each test against a fresh database and a mocked S3 bucket"""
+    
+    def setUp(self):
+        self.aws = mock_aws()
+        self.aws.start()
+        self.addCleanup(self.aws.stop)
+        
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.app = create_app()
+        
+        result = self.app.test_cli_runner().invoke(args=["init-db"])
+        self.assertIsNone(result.exception, result.output)
+        self.addCleanup(self._drop_tables)
+        
+        self.client = self.app.test_client()
+        self.s3 = boto3.client("s3", region_name=get_config().AWS_REGION)
+        self.s3.create_bucket(Bucket=get_config().S3_BUCKET_NAME)
+    
+    def _drop_tables(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+    
+    def create_user(self, username: str, password: str = "password123", role: str = "user") -> None:
+        """Insert a user straight into the database, bypassing AWS Transfer"""
+        with self.app.app_context():
+            user = User(username=username, email=f"{username}@example.com", role=role,
+                        status="active", is_active=True)
+            user.set_password(password, get_config().BCRYPT_ROUNDS)
+            db.session.add(user)
+            db.session.commit()
+    
+    def login(self, username: str = "admin", password: str = "admin") -> dict:
+        """Log in and return the Authorization header for the user"""
+        response = self.client.post("/api/auth/login", json={
+            "username": username,
+            "password": password
+        })
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+    
+    def put_object(self, key: str, body: bytes = b"data") -> None:
+        self.s3.put_object(Bucket=get_config().S3_BUCKET_NAME, Key=key, Body=body)
@@ -0,0 +1,85 @@
+"""
+Tests for the authentication middleware
+"""
+import unittest
+
+from flask import Blueprint
+
+from app.middleware.auth import admin_required, permission_required
+from tests.base import APITestCase
+
+class PermissionRequiredTests(APITestCase):
+    
+    def test_missing_token_is_rejected(self):
+        response = self.client.get("/api/files")
+        
+        self.assertEqual(response.status_code, 401)
+    
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get("/api/files", headers={"Authorization": "Bearer not-a-jwt"})
+        
+        self.assertEqual(response.status_code, 401)
+    
+    def test_missing_permission_is_rejected(self):
+        self.create_user("reader", role="readonly")
+        headers = self.login("reader", "password123")
+        
+        response = self.client.post("/api/create-folder", json={"folderName": "docs"}, headers=headers)
+        
+        self.assertEqual(response.status_code, 403)
+    
+    def test_granted_permission_reaches_view(self):
+        self.create_user("reader", role="readonly")
+        headers = self.login("reader", "password123")
+        
+        response = self.client.get("/api/files", headers=headers)
+        
+        self.assertEqual(response.status_code, 200)
+    
+    def test_blueprint_without_hook_fails_closed(self):
+        bp = Blueprint("unhooked", __name__, url_prefix="/unhooked")
+        
+        @bp.route("/files")
+        @permission_required("list_files")
+        def files():
+            return "listed"
+        
+        self.app.register_blueprint(bp)
+        headers = self.login()
+        
+        response = self.client.get("/unhooked/files", headers=headers)
+        
+        self.assertEqual(response.status_code, 403)
+
+class AdminRequiredTests(APITestCase):
+    
+    def test_non_admin_is_rejected(self):
+        self.create_user("alice")
+        headers = self.login("alice", "password123")
+        
+        response = self.client.delete("/api/delete-user/bob", headers=headers)
+        
+        self.assertEqual(response.status_code, 403)
+    
+    def test_missing_token_is_rejected(self):
+        response = self.client.delete("/api/delete-user/bob")
+        
+        self.assertEqual(response.status_code, 401)
+    
+    def test_blueprint_without_hook_fails_closed(self):
+        bp = Blueprint("unhooked", __name__, url_prefix="/unhooked")
+        
+        @bp.route("/admin")
+        @admin_required()
+        def admin_only():
+            return "admin"
+        
+        self.app.register_blueprint(bp)
+        headers = self.login()
+        
+        response = self.client.get("/unhooked/admin", headers=headers)
+        
+        self.assertEqual(response.status_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
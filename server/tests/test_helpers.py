@@ -0,0 +1,39 @@
+"""
+Tests for the general utility helpers
+"""
+import unittest
+from datetime import datetime
+
+from app.models.user import UserCreateRequest
+from app.utils.helpers import APIResponse, get_cached_utc_timestamp, validate_email
+
+class TimestampTests(unittest.TestCase):
+    
+    def test_cached_timestamp_is_utc_with_z_suffix(self):
+        timestamp = get_cached_utc_timestamp()
+        
+        self.assertTrue(timestamp.endswith("Z"), timestamp)
+        self.assertEqual(datetime.fromisoformat(timestamp[:-1]).microsecond, 0)
+    
+    def test_envelopes_share_the_format(self):
+        self.assertTrue(APIResponse.success()[0]["timestamp"].endswith("Z"))
+        self.assertTrue(APIResponse.error("failed")[0]["timestamp"].endswith("Z"))
+
+class ValidateEmailTests(unittest.TestCase):
+    
+    def test_accepts_plain_addresses(self):
+        for email in ("user@example.com", "first.last+tag@mail.example.co"):
+            with self.subTest(email=email):
+                self.assertTrue(validate_email(email))
+    
+    def test_rejects_malformed_or_oversized_addresses(self):
+        for email in ("", "user", "user@host", "user@example.com\n", "a@b." + "c" * 300):
+            with self.subTest(email=email):
+                self.assertFalse(validate_email(email))
+    
+    def test_user_model_uses_the_same_rules(self):
+        with self.assertRaises(ValueError):
+            UserCreateRequest(username="alice", password="password123", email="user@host")
+
+if __name__ == "__main__":
+    unittest.main()
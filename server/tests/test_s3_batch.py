@@ -0,0 +1,89 @@
+"""
+Tests for the batch delete and move endpoints
+"""
+import unittest
+from unittest import mock
+
+from botocore.client import BaseClient
+
+from app.config.settings import get_config
+from tests.base import APITestCase
+
+# Non-admin role that may delete and move, so requests reach the ownership check
+_MANAGER_PERMISSIONS = {"user": frozenset({"list_files", "delete_file", "move_file"})}
+
+class BatchEndpointTests(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.headers = self.login()
+    
+    def keys(self):
+        response = self.s3.list_objects_v2(Bucket=get_config().S3_BUCKET_NAME)
+        return sorted(obj["Key"] for obj in response.get("Contents", []))
+    
+    def test_delete_batch_removes_every_key(self):
+        self.put_object("a.txt")
+        self.put_object("b.txt")
+        
+        response = self.client.post("/api/delete-batch", json={"keys": ["a.txt", "b.txt"]}, headers=self.headers)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["failed"], [])
+        self.assertEqual(self.keys(), [])
+    
+    def test_delete_batch_reports_partial_failure(self):
+        self.put_object("a.txt")
+        self.put_object("locked.txt")
+        make_api_call = BaseClient._make_api_call
+        
+        def refuse_locked(client, operation, params):
+            if operation != "DeleteObjects":
+                return make_api_call(client, operation, params)
+            objects = params["Delete"]["Objects"]
+            kept = [obj for obj in objects if obj["Key"] != "locked.txt"]
+            response = make_api_call(client, operation, {**params, "Delete": {**params["Delete"], "Objects": kept}})
+            response["Errors"] = [{"Key": "locked.txt", "Code": "AccessDenied", "Message": "Access Denied"}]
+            return response
+        
+        with mock.patch.object(BaseClient, "_make_api_call", refuse_locked):
+            response = self.client.post("/api/delete-batch", json={"keys": ["a.txt", "locked.txt"]},
+                                        headers=self.headers)
+        
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.get_json()["failed"], ["locked.txt"])
+        self.assertEqual(self.keys(), ["locked.txt"])
+    
+    def test_move_batch_reports_partial_failure(self):
+        self.put_object("a.txt")
+        
+        response = self.client.post("/api/move-batch", json={"moves": [
+            {"sourceKey": "a.txt", "destinationKey": "docs/a.txt"},
+            {"sourceKey": "missing.txt", "destinationKey": "docs/missing.txt"},
+        ]}, headers=self.headers)
+        
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.get_json()["failed"], ["missing.txt"])
+        self.assertEqual(self.keys(), ["docs/a.txt"])
+    
+    def test_batch_rejects_keys_outside_the_user_prefix(self):
+        self.create_user("alice")
+        self.put_object("alice/a.txt")
+        self.put_object("bob/b.txt")
+        
+        with mock.patch.dict("app.services.auth_service._PERMISSIONS", _MANAGER_PERMISSIONS):
+            headers = self.login("alice", "password123")
+            delete = self.client.post("/api/delete-batch", json={"keys": ["alice/a.txt", "bob/b.txt"]},
+                                      headers=headers)
+            move = self.client.post("/api/move-batch", json={"moves": [
+                {"sourceKey": "alice/a.txt", "destinationKey": "bob/a.txt"}
+            ]}, headers=headers)
+            own = self.client.post("/api/delete-batch", json={"keys": ["alice/a.txt"]}, headers=headers)
+        
+        self.assertEqual(delete.status_code, 403)
+        self.assertEqual(move.status_code, 403)
+        self.assertEqual(own.status_code, 200)
+        self.assertEqual(self.keys(), ["bob/b.txt"])
+
+if __name__ == "__main__":
+    unittest.main()
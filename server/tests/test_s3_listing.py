@@ -0,0 +1,45 @@
+"""
+Tests for the S3 listing endpoints
+"""
+import unittest
+
+from tests.base import APITestCase
+
+class ListFilesTests(APITestCase):
+    
+    def test_max_keys_counts_folders_and_files(self):
+        for i in range(5):
+            self.put_object(f"folder{i}/file.txt")
+            self.put_object(f"root{i}.txt")
+        headers = self.login()
+        
+        response = self.client.get("/api/files?maxKeys=2", headers=headers)
+        
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(len(body["objects"]), 2)
+        self.assertTrue(body["hasMore"])
+    
+    def test_folder_named_stream_is_listed(self):
+        self.put_object("stream/video.mp4")
+        headers = self.login()
+        
+        response = self.client.get("/api/files/stream", headers=headers)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["folder"], "stream")
+        self.assertEqual([obj["key"] for obj in response.get_json()["objects"]], ["stream/video.mp4"])
+    
+    def test_stream_returns_one_line_per_object(self):
+        self.put_object("a.txt")
+        self.put_object("docs/b.txt")
+        headers = self.login()
+        
+        response = self.client.get("/api/files-stream", headers=headers)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual(len(response.get_data().splitlines()), 2)
+
+if __name__ == "__main__":
+    unittest.main()
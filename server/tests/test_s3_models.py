@@ -0,0 +1,44 @@
+"""
+Tests for the S3 request and response models
+"""
+import unittest
+from datetime import datetime
+
+from app.models.s3 import S3CreateFolderRequest, S3Object
+
+class S3ObjectTests(unittest.TestCase):
+    
+    def test_name_and_extension(self):
+        cases = {
+            "docs/Report.PDF": ("Report.PDF", "pdf"),
+            "docs/archive.tar.gz": ("archive.tar.gz", "gz"),
+            "README": ("README", None),
+            "docs/reports/": ("reports", None),
+        }
+        for key, (name, extension) in cases.items():
+            with self.subTest(key=key):
+                obj = S3Object(Key=key, Size=0, LastModified=datetime(2024, 1, 1))
+                self.assertEqual((obj.name, obj.extension), (name, extension))
+                data = obj.to_dict()
+                self.assertEqual((data["name"], data["extension"]), (name, extension))
+                self.assertEqual(data["isFolder"], key.endswith("/"))
+
+class CreateFolderRequestTests(unittest.TestCase):
+    
+    def test_accepts_names_with_letters_or_digits(self):
+        for name in ("docs", "2024", "team_a-reports", "_drafts", "données"):
+            with self.subTest(name=name):
+                S3CreateFolderRequest(folderName=name).validate()
+    
+    def test_rejects_names_without_letters_or_digits(self):
+        for name in ("---", "___", "-_-"):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                S3CreateFolderRequest(folderName=name).validate()
+    
+    def test_rejects_separators(self):
+        for name in ("a/b", "..", "a b"):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                S3CreateFolderRequest(folderName=name).validate()
+
+if __name__ == "__main__":
+    unittest.main()
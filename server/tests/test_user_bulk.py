@@ -0,0 +1,81 @@
+"""
+Tests for bulk user creation
+"""
+import unittest
+
+from tests.base import APITestCase
+
+class CreateUsersTests(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.headers = self.login()
+    
+    def create_users(self, users):
+        return self.client.post("/api/create-users", json={"users": users}, headers=self.headers)
+    
+    def test_creates_every_user(self):
+        response = self.create_users([
+            {"username": "alice", "password": "password123", "email": "alice@example.com"},
+            {"username": "bob", "password": "password123"},
+        ])
+        
+        self.assertEqual(response.status_code, 201, response.get_data(as_text=True))
+        self.assertEqual([user["username"] for user in response.get_json()["users"]], ["alice", "bob"])
+    
+    def test_non_object_entry_is_a_validation_error(self):
+        response = self.create_users([{"username": "alice", "password": "password123"}, "bob"])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("users[1]", response.get_json()["message"])
+    
+    def test_invalid_entry_names_its_index(self):
+        response = self.create_users([{"username": "al", "password": "password123"}])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("users[0]", response.get_json()["message"])
+    
+    def test_existing_username_is_rejected_without_partial_writes(self):
+        self.create_user("alice")
+        
+        response = self.create_users([
+            {"username": "bob", "password": "password123"},
+            {"username": "alice", "password": "password123"},
+        ])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("alice", response.get_json()["message"])
+        self.assertEqual(self.client.get("/api/users/bob", headers=self.headers).status_code, 404)
+    
+    def test_repeated_email_is_a_validation_error(self):
+        response = self.create_users([
+            {"username": "alice", "password": "password123", "email": "x@example.com"},
+            {"username": "bob", "password": "password123", "email": "x@example.com"},
+        ])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("$2b$", response.get_data(as_text=True))
+    
+    def test_existing_email_is_rejected(self):
+        self.create_user("alice")
+        
+        response = self.create_users([
+            {"username": "bob", "password": "password123", "email": "alice@example.com"},
+        ])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("alice@example.com", response.get_json()["message"])
+        self.assertNotIn("$2b$", response.get_data(as_text=True))
+    
+    def test_requires_admin(self):
+        self.create_user("alice")
+        headers = self.login("alice", "password123")
+        
+        response = self.client.post("/api/create-users", json={"users": [
+            {"username": "bob", "password": "password123"}
+        ]}, headers=headers)
+        
+        self.assertEqual(response.status_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
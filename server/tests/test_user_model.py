@@ -0,0 +1,19 @@
+"""
+Tests for the User database model
+"""
+import unittest
+
+from app.models.database import User
+
+class HashNeedsRehashTests(unittest.TestCase):
+    
+    def test_lower_cost_is_upgraded(self):
+        self.assertTrue(User.hash_needs_rehash(User.hash_password("secret", rounds=4), 5))
+    
+    def test_same_or_higher_cost_is_kept(self):
+        password_hash = User.hash_password("secret", rounds=5)
+        self.assertFalse(User.hash_needs_rehash(password_hash, 5))
+        self.assertFalse(User.hash_needs_rehash(password_hash, 4))
+
+if __name__ == "__main__":
+    unittest.main()